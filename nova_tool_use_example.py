@@ -10,7 +10,7 @@ import random
 import hashlib
 import datetime
 import time
-import inspect
+import sys
 from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient, InvokeModelWithBidirectionalStreamOperationInput
 from aws_sdk_bedrock_runtime.models import InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart
 from aws_sdk_bedrock_runtime.config import Config, HTTPAuthSchemeResolver, SigV4AuthScheme
@@ -32,9 +32,9 @@ DEBUG = False
 def debug_print(message):
     """Print only if debug mode is enabled"""
     if DEBUG:
-        functionName = inspect.stack()[1].function
+        functionName = sys._getframe(1).f_code.co_name
         if  functionName == 'time_it' or functionName == 'time_it_async':
-            functionName = inspect.stack()[2].function
+            functionName = sys._getframe(2).f_code.co_name
         print('{:%Y-%m-%d %H:%M:%S.%f}'.format(datetime.datetime.now())[:-3] + ' ' + functionName + ' ' + message)
 
 def time_it(label, methodToRun):
@@ -1,9 +1,7 @@
 import asyncio
-import base64
-import datetime
-import inspect
-import json
+import sys
 import time
+from binascii import b2a_base64
 
 from aws_sdk_bedrock_runtime.client import (
     BedrockRuntimeClient,
@@ -22,25 +20,33 @@ from smithy_aws_core.credentials_resolvers.environment import (
     EnvironmentCredentialsResolver,
 )
 
+from .serialization import JSONDecodeError, dumps, loads
+
 # Tool handling will be injected from outside
 
 
+# The cli module, imported on first use to avoid circular imports. DEBUG is
+# read from it on every call because the CLI sets it at runtime.
+_cli_module = None
+
+
 def debug_print(message):
     """Print only if debug mode is enabled"""
-    # Import DEBUG from cli module to avoid circular imports
-    from .cli import DEBUG
-
-    if DEBUG:
-        functionName = inspect.stack()[1].function
-        if functionName == "time_it" or functionName == "time_it_async":
-            functionName = inspect.stack()[2].function
-        print(
-            f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S.%f}"[:-3]
-            + " "
-            + functionName
-            + " "
-            + message
-        )
+    global _cli_module
+    if _cli_module is None:
+        from . import cli
+
+        _cli_module = cli
+
+    if not _cli_module.DEBUG:
+        return
+
+    functionName = sys._getframe(1).f_code.co_name
+    if functionName == "time_it" or functionName == "time_it_async":
+        functionName = sys._getframe(2).f_code.co_name
+    now = time.time()
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    print(f"{timestamp}.{int(now % 1 * 1000):03d} {functionName} {message}")
 
 
 def time_it(label, methodToRun):
@@ -63,15 +69,16 @@ class BedrockStreamManager:
     """Manages bidirectional streaming with AWS Bedrock using asyncio"""
 
     # Event templates - simplified to keep only what's needed for transport
-    AUDIO_EVENT_TEMPLATE = """{
-        "event": {
-            "audioInput": {
-            "promptName": "%s",
-            "contentName": "%s",
-            "content": "%s"
-            }
-        }
-    }"""
+    # Audio events are assembled as bytes around the base64 payload so the
+    # encoded audio never has to round-trip through str
+    AUDIO_EVENT_PREFIX = (
+        '{"event":{"audioInput":{"promptName":"%s","contentName":"%s","content":"'
+    )
+    AUDIO_EVENT_SUFFIX = b'"}}}'
+
+    # Maximum number of pending microphone chunks (~6s of audio); the oldest
+    # chunk is dropped when the stream can't keep up
+    AUDIO_INPUT_QUEUE_SIZE = 200
 
     TOOL_CONTENT_START_EVENT = """{
         "event": {
@@ -119,7 +126,7 @@ class BedrockStreamManager:
         """Create a tool result event"""
 
         if isinstance(content, dict):
-            content_json_string = json.dumps(content)
+            content_json_string = dumps(content)
         else:
             content_json_string = content
 
@@ -132,7 +139,7 @@ class BedrockStreamManager:
                 }
             }
         }
-        return json.dumps(tool_result_event)
+        return dumps(tool_result_event)
 
     def __init__(
         self,
@@ -148,9 +155,24 @@ class BedrockStreamManager:
         self.agent = agent  # Reference to speech agent for callbacks
 
         # Replace RxPy subjects with asyncio queues
-        self.audio_input_queue = asyncio.Queue()
+        self.audio_input_queue = asyncio.Queue(maxsize=self.AUDIO_INPUT_QUEUE_SIZE)
         self.audio_output_queue = asyncio.Queue()
         self.output_queue = asyncio.Queue()
+        self.dropped_audio_chunks = 0  # Chunks discarded due to a full input queue
+
+        # Serializes writes so a batch reaches the stream without other events
+        # (e.g. audio chunks) interleaved between its frames
+        self._send_lock = asyncio.Lock()
+
+        # Event fragments specialized for the session prompt, see configure_prompt
+        self.prompt_name = None
+        self._content_end_fmt = None
+        self._prompt_end_event = None
+
+        # audioInput prefix for the current audio content, see
+        # send_audio_content_start_event
+        self._audio_event_names = None
+        self._audio_event_prefix = None
 
         self.response_task = None
         self.audio_input_task = None
@@ -162,6 +184,28 @@ class BedrockStreamManager:
         # Audio playback components
         self.audio_player = None
 
+    def configure_prompt(self, prompt_name):
+        """Pre-build the event fragments that only depend on the prompt name."""
+        self.prompt_name = prompt_name
+        self._content_end_fmt = (
+            (
+                '{"event":{"contentEnd":{"promptName":"'
+                + prompt_name
+                + '","contentName":"'
+            ).encode("utf-8"),
+            b'"}}}',
+        )
+        self._prompt_end_event = (
+            '{"event":{"promptEnd":{"promptName":"' + prompt_name + '"}}}'
+        ).encode("utf-8")
+
+    def _content_end_event(self, prompt_name, content_name):
+        """Build a content end event, using the prebuilt fragments when possible."""
+        if prompt_name == self.prompt_name:
+            prefix, suffix = self._content_end_fmt
+            return prefix + content_name.encode("utf-8") + suffix
+        return self.CONTENT_END_EVENT % (prompt_name, content_name)
+
     def _initialize_client(self):
         """Initialize the Bedrock client."""
         config = Config(
@@ -260,20 +304,51 @@ class BedrockStreamManager:
                 return False
         return True
 
-    async def send_raw_event(self, event_json):
-        """Send a raw event JSON to the Bedrock stream."""
+    async def _ensure_can_send(self):
+        """Check that events can be written to the stream."""
         # Check if stream is closed first
         if self.is_stream_closed:
             debug_print("Cannot send event - stream is closed")
-            return
+            return False
 
         # Ensure stream is active before sending
         if not await self.ensure_stream_active():
             debug_print("Cannot send event - stream initialization failed")
+            return False
+
+        return True
+
+    async def send_raw_event(self, event_json, event_type=None):
+        """Send a raw event JSON (str or UTF-8 bytes) to the Bedrock stream.
+
+        event_type is only used for debug logging, so callers that built the
+        event can name it without the payload being parsed again.
+        """
+        if await self._ensure_can_send():
+            async with self._send_lock:
+                await self._send_event(event_json, event_type)
+
+    async def send_raw_events_batch(self, events):
+        """Send several raw events in order, checking the stream state once.
+
+        The events are written back to back under the send lock, so no other
+        event can land between them.
+        """
+        if not await self._ensure_can_send():
             return
 
+        async with self._send_lock:
+            for event_json in events:
+                if not await self._send_event(event_json):
+                    break
+
+    async def _send_event(self, event_json, event_type=None):
+        """Write a single event to the input stream. Returns True on success."""
+        if isinstance(event_json, str):
+            event_json = event_json.encode("utf-8")
+
         event = InvokeModelWithBidirectionalStreamInputChunk(
-            value=BidirectionalInputPayloadPart(bytes_=event_json.encode("utf-8"))
+            value=BidirectionalInputPayloadPart(bytes_=event_json)
         )
 
         try:
@@ -282,11 +357,13 @@ class BedrockStreamManager:
             from .cli import DEBUG
 
             if DEBUG:
-                if len(event_json) > 200:
-                    event_type = json.loads(event_json).get("event", {}).keys()
-                    debug_print(f"Sent event type: {list(event_type)}")
+                if event_type:
+                    debug_print(f"Sent event type: {event_type}")
+                elif len(event_json) > 200:
+                    debug_print(f"Sent event: {len(event_json)} bytes")
                 else:
-                    debug_print(f"Sent event: {event_json}")
+                    debug_print(f"Sent event: {event_json.decode('utf-8')}")
+            return True
         except Exception as e:
             error_str = str(e)
             debug_print(f"Error sending event: {error_str}")
@@ -310,9 +387,21 @@ class BedrockStreamManager:
                 import traceback
 
                 traceback.print_exc()
+            return False
+
+    def _audio_event_prefix_for(self, prompt_name, content_name):
+        """Get the audioInput event prefix, building it for unseen content."""
+        if (prompt_name, content_name) != self._audio_event_names:
+            self._audio_event_prefix = (
+                self.AUDIO_EVENT_PREFIX % (prompt_name, content_name)
+            ).encode("utf-8")
+            self._audio_event_names = (prompt_name, content_name)
+        return self._audio_event_prefix
 
     async def send_audio_content_start_event(self, prompt_name, audio_content_name):
         """Send a content start event to the Bedrock stream."""
+        # Audio chunks for this content all share the same event prefix
+        self._audio_event_prefix_for(prompt_name, audio_content_name)
         content_start_event = f"""{{
             "event": {{
                 "contentStart": {{
@@ -332,7 +421,7 @@ class BedrockStreamManager:
                 }}
             }}
         }}"""
-        await self.send_raw_event(content_start_event)
+        await self.send_raw_event(content_start_event, "contentStart")
 
     async def _process_audio_input(self):
         """Process audio input from the queue and send to Bedrock."""
@@ -371,16 +460,17 @@ class BedrockStreamManager:
                     # Still process but log it
 
                 try:
-                    # Base64 encode the audio data
-                    blob = base64.b64encode(audio_bytes)
-                    audio_event = self.AUDIO_EVENT_TEMPLATE % (
-                        prompt_name,
-                        content_name,
-                        blob.decode("utf-8"),
+                    # Base64 encode the audio data straight into the event bytes
+                    audio_event = b"".join(
+                        (
+                            self._audio_event_prefix_for(prompt_name, content_name),
+                            b2a_base64(audio_bytes, newline=False),
+                            self.AUDIO_EVENT_SUFFIX,
+                        )
                     )
 
                     # Send the event
-                    await self.send_raw_event(audio_event)
+                    await self.send_raw_event(audio_event, "audioInput")
 
                     # Reset error counter on successful processing
                     consecutive_errors = 0
@@ -423,14 +513,22 @@ class BedrockStreamManager:
         debug_print("Audio input processing stopped")
 
     def add_audio_chunk(self, audio_bytes, prompt_name, content_name):
-        """Add an audio chunk to the queue."""
-        self.audio_input_queue.put_nowait(
-            {
-                "audio_bytes": audio_bytes,
-                "prompt_name": prompt_name,
-                "content_name": content_name,
-            }
-        )
+        """Add an audio chunk to the queue, dropping the oldest one if full."""
+        chunk = {
+            "audio_bytes": audio_bytes,
+            "prompt_name": prompt_name,
+            "content_name": content_name,
+        }
+        try:
+            self.audio_input_queue.put_nowait(chunk)
+        except asyncio.QueueFull:
+            self.audio_input_queue.get_nowait()
+            self.audio_input_queue.put_nowait(chunk)
+            self.dropped_audio_chunks += 1
+            debug_print(
+                f"Audio input queue full, dropped oldest chunk "
+                f"(total dropped: {self.dropped_audio_chunks})"
+            )
 
     async def send_audio_content_end_event(self, prompt_name, audio_content_name):
         """Send a content end event to the Bedrock stream."""
@@ -438,11 +536,8 @@ class BedrockStreamManager:
             debug_print("Stream is not active")
             return
 
-        content_end_event = self.CONTENT_END_EVENT % (
-            prompt_name,
-            audio_content_name,
-        )
-        await self.send_raw_event(content_end_event)
+        content_end_event = self._content_end_event(prompt_name, audio_content_name)
+        await self.send_raw_event(content_end_event, "contentEnd")
         debug_print("Audio ended")
 
     async def send_tool_start_event(self, content_name, tool_use_id, prompt_name):
@@ -453,7 +548,7 @@ class BedrockStreamManager:
             tool_use_id,
         )
         debug_print(f"Sending tool start event: {content_start_event}")
-        await self.send_raw_event(content_start_event)
+        await self.send_raw_event(content_start_event, "contentStart")
 
     async def send_tool_result_event(self, content_name, tool_result, prompt_name):
         """Send a tool content event to the Bedrock stream."""
@@ -465,16 +560,30 @@ class BedrockStreamManager:
             prompt_name=prompt_name,
         )
         debug_print(f"Sending tool result event: {tool_result_event}")
-        await self.send_raw_event(tool_result_event)
+        await self.send_raw_event(tool_result_event, "toolResult")
 
     async def send_tool_content_end_event(self, content_name, prompt_name):
         """Send a tool content end event to the Bedrock stream."""
-        tool_content_end_event = self.CONTENT_END_EVENT % (
-            prompt_name,
-            content_name,
-        )
+        tool_content_end_event = self._content_end_event(prompt_name, content_name)
         debug_print(f"Sending tool content event: {tool_content_end_event}")
-        await self.send_raw_event(tool_content_end_event)
+        await self.send_raw_event(tool_content_end_event, "contentEnd")
+
+    async def send_tool_result_bundle(
+        self, content_name, tool_use_id, tool_result, prompt_name
+    ):
+        """Send the tool content start, result and end events in one batch."""
+        events = (
+            self.TOOL_CONTENT_START_EVENT % (prompt_name, content_name, tool_use_id),
+            self.tool_result_event(
+                content_name=content_name,
+                content=tool_result,
+                role="TOOL",
+                prompt_name=prompt_name,
+            ),
+            self._content_end_event(prompt_name, content_name),
+        )
+        debug_print(f"Sending tool result bundle for tool use {tool_use_id}")
+        await self.send_raw_events_batch(events)
 
     async def send_prompt_end_event(self, prompt_name):
         """Close the stream and clean up resources."""
@@ -482,8 +591,11 @@ class BedrockStreamManager:
             debug_print("Stream is not active")
             return
 
-        prompt_end_event = self.PROMPT_END_EVENT % (prompt_name)
-        await self.send_raw_event(prompt_end_event)
+        if prompt_name == self.prompt_name:
+            prompt_end_event = self._prompt_end_event
+        else:
+            prompt_end_event = self.PROMPT_END_EVENT % (prompt_name)
+        await self.send_raw_event(prompt_end_event, "promptEnd")
         debug_print("Prompt ended")
 
     async def send_session_end_event(self):
@@ -492,7 +604,7 @@ class BedrockStreamManager:
             debug_print("Stream is not active")
             return
 
-        await self.send_raw_event(self.SESSION_END_EVENT)
+        await self.send_raw_event(self.SESSION_END_EVENT, "sessionEnd")
         self.is_active = False
         debug_print("Session ended")
 
@@ -509,8 +621,8 @@ class BedrockStreamManager:
 
                     if result.value and result.value.bytes_:
                         try:
-                            response_data = result.value.bytes_.decode("utf-8")
-                            json_data = json.loads(response_data)
+                            # Parse the UTF-8 payload directly, no str copy first
+                            json_data = loads(result.value.bytes_)
 
                             # Reset error counter on successful processing
                             consecutive_errors = 0
@@ -522,7 +634,7 @@ class BedrockStreamManager:
                             # Put the response in the output queue for other components
                             await self.output_queue.put(json_data)
 
-                        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                        except (JSONDecodeError, UnicodeDecodeError) as e:
                             consecutive_errors += 1
                             debug_print(
                                 f"Error decoding response data (attempt {consecutive_errors}): {e}"
@@ -636,21 +748,28 @@ class BedrockStreamManager:
             return
 
         debug_print("Closing stream...")
-        self.is_active = False
 
-        # Send closing events if stream is still active
-        if not self.is_stream_closed and self.stream_response:
-            try:
-                if prompt_name and audio_content_name:
-                    await self.send_audio_content_end_event(
-                        prompt_name, audio_content_name
-                    )
-                    await self.send_prompt_end_event(prompt_name)
+        # Send closing events if stream is still active, pipelined in one
+        # ordered batch so shutdown doesn't pay a round trip per event
+        if self.is_active and self.stream_response:
+            closing_events = []
+            if prompt_name and audio_content_name:
+                closing_events.append(
+                    self._content_end_event(prompt_name, audio_content_name)
+                )
+                if prompt_name == self.prompt_name:
+                    closing_events.append(self._prompt_end_event)
+                else:
+                    closing_events.append(self.PROMPT_END_EVENT % (prompt_name))
+            closing_events.append(self.SESSION_END_EVENT)
 
-                await self.send_session_end_event()
+            try:
+                await self.send_raw_events_batch(closing_events)
             except Exception as e:
                 debug_print(f"Error sending closing events: {e}")
 
+        self.is_active = False
+
         # Clean up resources
         await self._cleanup_stream()
         self.is_stream_closed = True
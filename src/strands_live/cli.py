@@ -5,6 +5,7 @@ This CLI provides options to configure project context gathering capabilities.
 """
 import argparse
 import asyncio
+import sys
 import warnings
 from pathlib import Path
 from typing import List, Optional
@@ -37,6 +38,25 @@ def get_default_tools():
     ]
 
 
+def get_event_loop_options() -> dict:
+    """Get asyncio.run() keyword arguments that select uvloop when it is installed.
+
+    Returns:
+        Keyword arguments for asyncio.run(); empty to use the default loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return {}
+
+    if sys.version_info >= (3, 12):
+        return {"loop_factory": uvloop.new_event_loop}
+
+    # asyncio.run() only accepts a loop factory from Python 3.12
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return {}
+
+
 def parse_file_patterns(patterns_str: str) -> List[str]:
     """Parse comma-separated file patterns string.
     
@@ -159,10 +179,19 @@ async def async_main(debug: bool = False,
         if debug:
             import traceback
             traceback.print_exc()
+    finally:
+        # Not every handler owns resources (ToolHandler has no close)
+        close = getattr(tool_handler, "close", None)
+        if close is not None:
+            close()
+
 
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser.
 
-def main():
-    """Entry point for the CLI application."""
+    Returns:
+        Parser for the strands-live command line options.
+    """
     parser = argparse.ArgumentParser(
         description="Strands Live Speech Agent with Context Gathering",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -251,8 +280,17 @@ Examples:
         action="store_true",
         help="Show the full raw context that will be sent to the model"
     )
-    
-    args = parser.parse_args()
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point for the CLI application.
+
+    Args:
+        argv: Command line arguments; defaults to sys.argv[1:]
+    """
+    args = build_arg_parser().parse_args(argv)
 
     # Parse file patterns
     file_patterns = parse_file_patterns(args.file_patterns) if args.file_patterns else None
@@ -272,7 +310,7 @@ Examples:
             max_files=args.max_files,
             custom_prompt=args.custom_prompt,
             show_context=args.show_context
-        ))
+        ), **get_event_loop_options())
     except KeyboardInterrupt:
         print("\n👋 Interrupted by user")
     except Exception as e:
@@ -4,15 +4,57 @@ Context builder for Strands Live Speech Agent.
 This module provides functionality to automatically gather context from the current
 directory and relevant files to enhance the agent's awareness of the working environment.
 """
+import atexit
+import io
 import os
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Worker threads for overlapping file reads and git queries, shared by all
+# builders so each build doesn't pay for starting new threads
+_context_pool: Optional[ThreadPoolExecutor] = None
+_context_pool_lock = threading.Lock()
+
+
+def _get_context_pool() -> ThreadPoolExecutor:
+    """Get the shared context thread pool, creating it on first use."""
+    global _context_pool
+    if _context_pool is None:
+        with _context_pool_lock:
+            if _context_pool is None:
+                _context_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='context')
+                atexit.register(_context_pool.shutdown)
+    return _context_pool
 
 
 class ContextBuilder:
     """Builds context information for the speech agent."""
 
+    # A single porcelain v2 status reports the branch and working tree
+    # state; together with the log that's everything the git context needs
+    GIT_QUERIES = (
+        ['--no-optional-locks', 'status', '--branch', '--porcelain=v2',
+         '--untracked-files=normal'],
+        ['log', '--oneline', '-5'],
+    )
+
+    # How long built context stays valid before the file system is re-read
+    CONTEXT_CACHE_TTL = 30.0
+
+    # Upper bound on how much of a context file is read in one go
+    MAX_FILE_READ_BYTES = 64 * 1024
+
+    DEFAULT_FILE_PATTERNS = ('README.md', 'AmazonQ.md', 'CHANGELOG.md', 'package.json', 'pyproject.toml')
+
     def __init__(self, base_path: Optional[Union[str, Path]] = None):
         """Initialize the context builder.
         
@@ -20,6 +62,25 @@ class ContextBuilder:
             base_path: Base directory to gather context from. Defaults to current directory.
         """
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        # String forms of the base path, computed once for formatting and os calls
+        self._base_str = os.fspath(self.base_path)
+        self._abs_base = os.fspath(self.base_path.absolute())
+
+        # build_full_context results keyed by their options: (timestamp, context)
+        self._context_cache: Dict[tuple, Tuple[float, str]] = {}
+        # Last git context with the .git state it was built from
+        self._git_cache: Optional[Tuple[tuple, float, str]] = None
+        # Sorted directory listings keyed by path: (directory mtime, entries)
+        self._dir_cache: Dict[str, Tuple[int, List[tuple]]] = {}
+        # Context files found missing, with their directory's mtime at the time
+        self._missing_files: Dict[Path, int] = {}
+
+    def invalidate(self) -> None:
+        """Drop cached context so the next build re-reads the file system."""
+        self._context_cache.clear()
+        self._git_cache = None
+        self._dir_cache.clear()
+        self._missing_files.clear()
         
     def get_directory_context(self, max_depth: int = 2, max_files: int = 20) -> str:
         """Get directory structure context.
@@ -38,90 +99,151 @@ class ContextBuilder:
             return f"""
 ## Current Directory Structure
 
-**Working Directory:** `{self.base_path.absolute()}`
+**Working Directory:** `{self._abs_base}`
 
 ```
 {tree_output}
 ```
 """
         except Exception as e:
-            return f"## Current Directory\n**Working Directory:** `{self.base_path.absolute()}`\n*Error getting directory structure: {e}*\n"
+            return f"## Current Directory\n**Working Directory:** `{self._abs_base}`\n*Error getting directory structure: {e}*\n"
     
     def _get_directory_tree(self, max_depth: int = 2, max_files: int = 20) -> str:
-        """Get directory tree using system tree command or manual traversal."""
-        try:
-            # Try using system 'tree' command first
-            result = subprocess.run(
-                ['tree', '-L', str(max_depth), '-a', '--dirsfirst', str(self.base_path)],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                return result.stdout
-        except (subprocess.SubprocessError, FileNotFoundError):
-            pass
-        
-        # Fallback to manual directory traversal
+        """Get directory tree by walking the file system."""
         return self._manual_directory_tree(max_depth=max_depth, max_files=max_files)
     
     def _manual_directory_tree(self, max_depth: int = 2, max_files: int = 20) -> str:
-        """Manually create directory tree."""
-        lines = []
+        """Manually create directory tree.
+
+        Uses os.scandir so entry types come from the directory listing itself
+        instead of a separate stat() per entry, and writes lines straight into
+        a StringIO rather than formatting each one.
+        """
+        buf = io.StringIO()
+        write = buf.write
+        write(self.base_path.name)
         file_count = 0
         
-        def _traverse(path: Path, prefix: str = "", depth: int = 0):
+        def _traverse(path: str, prefix: str, depth: int):
             nonlocal file_count
             if depth > max_depth or file_count >= max_files:
                 return
                 
             try:
-                items = list(path.iterdir())
-                # Sort: directories first, then files
-                items.sort(key=lambda x: (x.is_file(), x.name.lower()))
-                
-                for i, item in enumerate(items):
-                    if file_count >= max_files:
-                        lines.append(f"{prefix}├── ... (truncated)")
-                        break
-                        
-                    is_last = i == len(items) - 1
-                    current_prefix = "└── " if is_last else "├── "
-                    lines.append(f"{prefix}{current_prefix}{item.name}")
-                    file_count += 1
-                    
-                    if item.is_dir() and depth < max_depth:
-                        next_prefix = prefix + ("    " if is_last else "│   ")
-                        _traverse(item, next_prefix, depth + 1)
-                        
+                items = self._list_directory(path)
             except PermissionError:
-                lines.append(f"{prefix}├── [Permission Denied]")
+                write("\n")
+                write(prefix)
+                write("├── [Permission Denied]")
+                return
+
+            last = len(items) - 1
+            for i, (is_file, _, name, entry_path) in enumerate(items):
+                if file_count >= max_files:
+                    write("\n")
+                    write(prefix)
+                    write("├── ... (truncated)")
+                    break
+                    
+                is_last = i == last
+                write("\n")
+                write(prefix)
+                write("└── " if is_last else "├── ")
+                write(name)
+                file_count += 1
+                
+                if not is_file and depth < max_depth:
+                    _traverse(entry_path, prefix + ("    " if is_last else "│   "), depth + 1)
         
-        lines.append(str(self.base_path.name))
-        _traverse(self.base_path, "", 0)
-        return "\n".join(lines)
+        _traverse(self._base_str, "", 0)
+        return buf.getvalue()
+
+    def _list_directory(self, path: str) -> List[tuple]:
+        """List a directory as sorted (is_file, sort_name, name, path) tuples.
+
+        Adding, removing or renaming an entry updates the directory's mtime,
+        so a listing is reused until that changes.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._dir_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with os.scandir(path) as it:
+            # Sort: directories first, then files
+            items = sorted(
+                (not entry.is_dir(follow_symlinks=False), entry.name.casefold(), entry.name, entry.path)
+                for entry in it
+            )
+        self._dir_cache[path] = (mtime, items)
+        return items
 
     def get_file_context(self, file_patterns: List[str] = None) -> str:
         """Get context from relevant files in the directory.
         
         Args:
             file_patterns: List of file patterns to look for. 
-                          Defaults to ['README.md', 'AmazonQ.md', 'CHANGELOG.md']
+                          Defaults to DEFAULT_FILE_PATTERNS
                           
         Returns:
             Formatted file contents
         """
         if file_patterns is None:
-            file_patterns = ['README.md', 'AmazonQ.md', 'CHANGELOG.md', 'package.json', 'pyproject.toml']
+            file_patterns = self.DEFAULT_FILE_PATTERNS
         
-        context_parts = []
+        candidates = self._file_candidates(file_patterns)
+        if not candidates:
+            return ""
+
+        # Reads are independent, so let the kernel overlap them
+        contents = list(_get_context_pool().map(
+            self._read_if_exists, [path for _, path, _ in candidates]
+        ))
         
+        return self._collect_file_context(candidates, contents)
+
+    def _file_candidates(self, file_patterns: Sequence[str]) -> List[Tuple[str, Path, Optional[int]]]:
+        """Resolve patterns to (pattern, path, directory mtime), skipping known-missing files.
+
+        A file recorded as missing is skipped until its directory's mtime
+        changes, which happens whenever an entry is created in it.
+        """
+        dir_mtimes: Dict[Path, Optional[int]] = {}
+        candidates = []
         for pattern in file_patterns:
             file_path = self.base_path / pattern
-            if file_path.exists() and file_path.is_file():
-                content = self._read_file_safely(file_path)
-                if content:
-                    context_parts.append(f"""
+            parent = file_path.parent
+            if parent not in dir_mtimes:
+                try:
+                    dir_mtimes[parent] = os.stat(parent).st_mtime_ns
+                except OSError:
+                    dir_mtimes[parent] = None
+            mtime = dir_mtimes[parent]
+            if mtime is not None and self._missing_files.get(file_path) == mtime:
+                continue
+            candidates.append((pattern, file_path, mtime))
+        return candidates
+
+    def _collect_file_context(self,
+                              candidates: List[Tuple[str, Path, Optional[int]]],
+                              contents: List[Optional[str]]) -> str:
+        """Record missing files and format the contents that were read."""
+        for (_, file_path, mtime), content in zip(candidates, contents, strict=True):
+            if content is None and mtime is not None:
+                self._missing_files[file_path] = mtime
+            else:
+                self._missing_files.pop(file_path, None)
+
+        return self._format_file_context([pattern for pattern, _, _ in candidates], contents)
+
+    @staticmethod
+    def _format_file_context(file_patterns: List[str], contents: List[Optional[str]]) -> str:
+        """Render file contents as markdown sections in pattern order."""
+        context_parts = []
+        
+        for pattern, content in zip(file_patterns, contents, strict=True):
+            if content:
+                context_parts.append(f"""
 ## {pattern}
 
 ```
@@ -131,88 +253,297 @@ class ContextBuilder:
         
         return "\n".join(context_parts) if context_parts else ""
     
-    def _read_file_safely(self, file_path: Path, max_lines: int = 100) -> Optional[str]:
+    def _read_file_safely(self, file_path: Path, max_lines: int = 100,
+                          max_bytes: Optional[int] = None) -> Optional[str]:
         """Safely read file content with size limits.
         
         Args:
             file_path: Path to the file
             max_lines: Maximum number of lines to read
+            max_bytes: Maximum number of characters to read. Defaults to MAX_FILE_READ_BYTES
             
         Returns:
             File content or None if unable to read
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = []
-                for i, line in enumerate(f):
-                    if i >= max_lines:
-                        lines.append("... (truncated)")
-                        break
-                    lines.append(line.rstrip())
-                return "\n".join(lines)
-        except (UnicodeDecodeError, PermissionError, OSError) as e:
+            return self._read_text(file_path, max_lines, max_bytes)
+        except (PermissionError, OSError) as e:
             return f"[Error reading file: {e}]"
+
+    def _read_if_exists(self, file_path: Path) -> Optional[str]:
+        """Read a context file, returning None if it is missing or not a file.
+
+        Opening directly and handling the failure replaces separate
+        exists()/is_file() checks before the open.
+        """
+        try:
+            return self._read_text(file_path)
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+        except (PermissionError, OSError) as e:
+            return f"[Error reading file: {e}]"
+
+    def _read_text(self, file_path: Path, max_lines: int = 100,
+                   max_bytes: Optional[int] = None) -> str:
+        """Read and truncate file content, letting OSError propagate."""
+        if max_bytes is None:
+            max_bytes = self.MAX_FILE_READ_BYTES
+        with open(file_path, 'r', encoding='utf-8', errors='replace',
+                  buffering=self.MAX_FILE_READ_BYTES) as f:
+            data = f.read(max_bytes)
+            # Anything past the cap is unread, so the last line may be partial
+            truncated = len(data) == max_bytes and f.read(1) != ''
+
+        lines = data.splitlines()
+        if truncated and lines:
+            lines.pop()
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            truncated = True
+        lines = [line.rstrip() for line in lines]
+        if truncated:
+            lines.append("... (truncated)")
+        return "\n".join(lines)
     
+    def _run_git(self, args: List[str]) -> Optional[str]:
+        """Run a git command in the base path.
+
+        Returns:
+            Command stdout, or None if git exited with an error
+        """
+        result = subprocess.run(
+            ['git', *args],
+            capture_output=True,
+            text=True,
+            cwd=self.base_path,
+            timeout=2
+        )
+        return result.stdout if result.returncode == 0 else None
+
+    def _find_git_dir(self) -> Optional[str]:
+        """Find the .git entry governing the base path by walking up its parents.
+
+        Returns:
+            Path of the .git directory (or gitfile), or None outside a repository
+        """
+        path = self._abs_base
+        while True:
+            candidate = os.path.join(path, '.git')
+            if os.path.exists(candidate):
+                return candidate
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+    @staticmethod
+    def _git_state(git_dir: str) -> Optional[tuple]:
+        """Get the mtimes of HEAD and index in git_dir, or None if unavailable."""
+        try:
+            head_mtime = os.stat(os.path.join(git_dir, 'HEAD')).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            index_mtime = os.stat(os.path.join(git_dir, 'index')).st_mtime_ns
+        except OSError:
+            index_mtime = None
+        return (head_mtime, index_mtime)
+
+    def _get_cached_git_context(self, state: Optional[tuple]) -> Optional[str]:
+        """Return cached git context if HEAD and the index are unchanged."""
+        if state is None or self._git_cache is None:
+            return None
+        cached_state, timestamp, context = self._git_cache
+        if cached_state != state or time.monotonic() - timestamp > self.CONTEXT_CACHE_TTL:
+            return None
+        return context
+
+    def _store_git_context(self, state: Optional[tuple], context: str) -> str:
+        """Remember git context built for the given .git state."""
+        if state is not None:
+            self._git_cache = (state, time.monotonic(), context)
+        return context
+
     def get_git_context(self) -> str:
         """Get Git repository context if available."""
+        # A stat walk is far cheaper than spawning git just to learn there's no repository
+        git_dir = self._find_git_dir()
+        if git_dir is None:
+            return ""
+
+        state = self._git_state(git_dir)
+        cached = self._get_cached_git_context(state)
+        if cached is not None:
+            return cached
+
+        return self._store_git_context(state, self._read_git_context())
+
+    def _read_git_context(self) -> str:
+        """Build the repository context with pygit2 if available, else by running git."""
+        if pygit2 is not None:
+            try:
+                context = self._read_git_context_pygit2()
+            except (pygit2.GitError, KeyError, ValueError):
+                context = None
+            if context is not None:
+                return context
+
         try:
-            # Check if we're in a git repository
-            result = subprocess.run(
-                ['git', 'rev-parse', '--is-inside-work-tree'],
-                capture_output=True,
-                text=True,
-                cwd=self.base_path,
-                timeout=2
-            )
-            
-            if result.returncode != 0:
-                return ""
-            
-            # Get current branch and recent commits
-            branch_result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                capture_output=True,
-                text=True,
-                cwd=self.base_path,
-                timeout=2
-            )
-            
-            log_result = subprocess.run(
-                ['git', 'log', '--oneline', '-5'],
-                capture_output=True,
-                text=True,
-                cwd=self.base_path,
-                timeout=2
-            )
-            
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                cwd=self.base_path,
-                timeout=2
-            )
-            
-            git_info = []
-            
-            if branch_result.returncode == 0 and branch_result.stdout.strip():
-                git_info.append(f"**Current Branch:** `{branch_result.stdout.strip()}`")
-            
-            if log_result.returncode == 0:
-                git_info.append(f"**Recent Commits:**\n```\n{log_result.stdout.strip()}\n```")
-            
-            if status_result.returncode == 0 and status_result.stdout.strip():
-                git_info.append(f"**Working Directory Status:**\n```\n{status_result.stdout.strip()}\n```")
-            
-            if git_info:
-                return f"""## Git Repository Context
+            # Status and log don't depend on each other, so overlap them.
+            # A failing status means we're not inside a git repository.
+            status, log = _get_context_pool().map(self._run_git, self.GIT_QUERIES)
+
+            return self._format_git_context(status, log)
 
-{chr(10).join(git_info)}
-"""
-            
         except (subprocess.SubprocessError, FileNotFoundError):
             pass
-        
+
+        return ""
+
+    def _read_git_context_pygit2(self) -> Optional[str]:
+        """Build the repository context in-process with pygit2, without spawning git.
+
+        Returns None when the status may contain a staged rename, which pygit2
+        can't detect, so the caller falls back to the git CLI.
+        """
+        repo_path = pygit2.discover_repository(self._base_str)
+        if repo_path is None:
+            return ""
+        repo = pygit2.Repository(repo_path)
+
+        info = {"branch": None, "changes": []}
+        log = None
+
+        if repo.head_is_unborn:
+            info["branch"] = repo.references['HEAD'].target.removeprefix('refs/heads/')
+        else:
+            head = repo.head
+            if not repo.head_is_detached:
+                info["branch"] = head.shorthand
+
+            commits = []
+            for commit in repo.walk(head.target, pygit2.GIT_SORT_TIME):
+                subject = commit.message.partition('\n')[0]
+                commits.append(f"{commit.short_id} {subject}")
+                if len(commits) == 5:
+                    break
+            log = "\n".join(commits)
+
+        changes = self._pygit2_status_lines(repo)
+        if changes is None:
+            return None
+        info["changes"] = changes
+        return self._render_git_context(info, log)
+
+    @staticmethod
+    def _pygit2_status_lines(repo: Any) -> Optional[List[str]]:
+        """Render pygit2 status flags as short (porcelain v1 style) status lines.
+
+        Returns None if a staged deletion and a staged addition are both
+        present, since git may report the pair as a rename and pygit2's status
+        has no rename detection.
+        """
+        index_codes = (
+            (pygit2.GIT_STATUS_INDEX_NEW, 'A'),
+            (pygit2.GIT_STATUS_INDEX_MODIFIED, 'M'),
+            (pygit2.GIT_STATUS_INDEX_DELETED, 'D'),
+            (pygit2.GIT_STATUS_INDEX_RENAMED, 'R'),
+            (pygit2.GIT_STATUS_INDEX_TYPECHANGE, 'T'),
+        )
+        worktree_codes = (
+            (pygit2.GIT_STATUS_WT_MODIFIED, 'M'),
+            (pygit2.GIT_STATUS_WT_DELETED, 'D'),
+            (pygit2.GIT_STATUS_WT_RENAMED, 'R'),
+            (pygit2.GIT_STATUS_WT_TYPECHANGE, 'T'),
+        )
+
+        status = repo.status(untracked_files="normal")
+        all_flags = 0
+        for flags in status.values():
+            all_flags |= flags
+        rename_candidate = pygit2.GIT_STATUS_INDEX_NEW | pygit2.GIT_STATUS_INDEX_DELETED
+        if all_flags & rename_candidate == rename_candidate:
+            return None
+
+        tracked, untracked = [], []
+        for path, flags in sorted(status.items()):
+            if flags & pygit2.GIT_STATUS_CONFLICTED:
+                tracked.append(f"UU {path}")
+                continue
+            # A file removed from the index but still on disk is both "D " and "??"
+            if flags & pygit2.GIT_STATUS_WT_NEW:
+                untracked.append(f"?? {path}")
+            x = next((code for flag, code in index_codes if flags & flag), ' ')
+            y = next((code for flag, code in worktree_codes if flags & flag), ' ')
+            if x != ' ' or y != ' ':
+                tracked.append(f"{x}{y} {path}")
+
+        # git lists tracked changes before untracked files
+        return tracked + untracked
+
+    @staticmethod
+    def _parse_porcelain_v2(output: str) -> Dict[str, Any]:
+        """Parse `git status --branch --porcelain=v2` output.
+
+        Args:
+            output: Raw status output
+
+        Returns:
+            Dictionary with the branch and the working tree changes
+            rendered as short (porcelain v1 style) status lines
+        """
+        info = {"branch": None, "changes": []}
+
+        for line in output.splitlines():
+            if line.startswith('# '):
+                key, _, value = line[2:].partition(' ')
+                if key == 'branch.head' and value != '(detached)':
+                    info["branch"] = value
+            elif line.startswith('1 '):
+                fields = line.split(' ', 8)
+                info["changes"].append(f"{fields[1].replace('.', ' ')} {fields[8]}")
+            elif line.startswith('2 '):
+                fields = line.split(' ', 9)
+                path, _, orig_path = fields[9].partition('\t')
+                info["changes"].append(
+                    f"{fields[1].replace('.', ' ')} {orig_path} -> {path}"
+                )
+            elif line.startswith('u '):
+                fields = line.split(' ', 10)
+                info["changes"].append(f"{fields[1]} {fields[10]}")
+            elif line.startswith('? '):
+                info["changes"].append(f"?? {line[2:]}")
+
+        return info
+
+    def _format_git_context(self, status: Optional[str], log: Optional[str]) -> str:
+        """Format git command outputs into the context section."""
+        if status is None:
+            return ""
+
+        return self._render_git_context(self._parse_porcelain_v2(status), log)
+
+    @staticmethod
+    def _render_git_context(info: Dict[str, Any], log: Optional[str]) -> str:
+        """Render parsed repository information as the git context section."""
+        git_info = []
+
+        if info["branch"]:
+            git_info.append(f"**Current Branch:** `{info['branch']}`")
+
+        if log is not None:
+            git_info.append(f"**Recent Commits:**\n```\n{log.strip()}\n```")
+
+        if info["changes"]:
+            changes = "\n".join(info["changes"])
+            git_info.append(f"**Working Directory Status:**\n```\n{changes}\n```")
+
+        if git_info:
+            return f"""## Git Repository Context
+
+{chr(10).join(git_info)}
+"""
+
         return ""
     
     def build_full_context(self, 
@@ -231,22 +562,49 @@ class ContextBuilder:
         Returns:
             Complete context string
         """
-        context_parts = []
-        
-        if include_directory:
-            dir_context = self.get_directory_context()
-            if dir_context.strip():
-                context_parts.append(dir_context)
-        
-        if include_git:
-            git_context = self.get_git_context()
-            if git_context.strip():
-                context_parts.append(git_context)
-        
-        if include_files:
-            file_context = self.get_file_context(file_patterns)
-            if file_context.strip():
-                context_parts.append(file_context)
+        cache_key = self._context_cache_key(
+            include_directory, include_files, include_git, file_patterns
+        )
+        cached = self._get_cached_context(cache_key)
+        if cached is not None:
+            return cached
+
+        sections = [
+            self.get_directory_context() if include_directory else "",
+            self.get_git_context() if include_git else "",
+            self.get_file_context(file_patterns) if include_files else "",
+        ]
+        return self._store_context(cache_key, self._assemble_context(sections))
+
+    @staticmethod
+    def _context_cache_key(include_directory: bool,
+                           include_files: bool,
+                           include_git: bool,
+                           file_patterns: Optional[List[str]]) -> tuple:
+        """Build the build_full_context cache key for a set of options."""
+        return (
+            include_directory,
+            include_files,
+            include_git,
+            tuple(file_patterns) if file_patterns is not None else None,
+        )
+
+    def _get_cached_context(self, cache_key: tuple) -> Optional[str]:
+        """Return cached context for the key if it has not expired."""
+        cached = self._context_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] <= self.CONTEXT_CACHE_TTL:
+            return cached[1]
+        return None
+
+    def _store_context(self, cache_key: tuple, context: str) -> str:
+        """Remember built context for the key."""
+        self._context_cache[cache_key] = (time.monotonic(), context)
+        return context
+
+    @staticmethod
+    def _assemble_context(sections: List[str]) -> str:
+        """Wrap the non-empty context sections in the project context block."""
+        context_parts = [section for section in sections if section.strip()]
         
         if not context_parts:
             return ""
@@ -275,6 +633,15 @@ def create_enhanced_system_prompt(base_prompt: str = None,
     Returns:
         Enhanced system prompt with context
     """
+    if context_builder is None:
+        context_builder = ContextBuilder()
+    
+    project_context = context_builder.build_full_context(**context_options)
+    return _combine_prompt(base_prompt, project_context)
+
+
+def _combine_prompt(base_prompt: Optional[str], project_context: str) -> str:
+    """Append project context to the base prompt, using the default prompt if None."""
     if base_prompt is None:
         base_prompt = (
             "You are a helpful assistant based on Strands Agents. You can access internet, customer's files and AWS account through tools. "
@@ -282,11 +649,6 @@ def create_enhanced_system_prompt(base_prompt: str = None,
             "When reading order numbers, please read each digit individually, separated by pauses. For example, order #1234 should be read as 'order number one-two-three-four' rather than 'order number one thousand two hundred thirty-four'."
         )
     
-    if context_builder is None:
-        context_builder = ContextBuilder()
-    
-    project_context = context_builder.build_full_context(**context_options)
-    
     if project_context.strip():
         return f"{base_prompt}\n\n{project_context}"
     else:
@@ -1,40 +1,39 @@
 import asyncio
-import base64
-import datetime
-import inspect
 import json
 import os
+import sys
 import time
 import uuid
+from binascii import a2b_base64, b2a_base64
+from collections import deque
 
 import websockets
 
+# The cli module once imported, or False if it can't be (always print then).
+# DEBUG is read from it on every call because the CLI sets it at runtime.
+_cli_module = None
+
 
 def debug_print(message):
     """Print only if debug mode is enabled"""
-    try:
-        from .cli import DEBUG
-
-        if DEBUG:
-            functionName = inspect.stack()[1].function
-            if functionName == "time_it" or functionName == "time_it_async":
-                functionName = inspect.stack()[2].function
-            print(
-                f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S.%f}"[:-3]
-                + " "
-                + functionName
-                + " "
-                + message
-            )
-    except ImportError:
-        functionName = inspect.stack()[1].function
-        print(
-            f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S.%f}"[:-3]
-            + " "
-            + functionName
-            + " "
-            + message
-        )
+    global _cli_module
+    if _cli_module is None:
+        try:
+            from . import cli
+
+            _cli_module = cli
+        except ImportError:
+            _cli_module = False
+
+    if _cli_module is not False and not _cli_module.DEBUG:
+        return
+
+    functionName = sys._getframe(1).f_code.co_name
+    if functionName == "time_it" or functionName == "time_it_async":
+        functionName = sys._getframe(2).f_code.co_name
+    now = time.time()
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    print(f"{timestamp}.{int(now % 1 * 1000):03d} {functionName} {message}")
 
 
 def time_it(label, methodToRun):
@@ -56,6 +55,24 @@ async def time_it_async(label, methodToRun):
 class GeminiLiveStreamManager:
     """Manages bidirectional streaming with Gemini Live API using WebSockets"""
 
+    # Most queued audio chunks merged into a single realtime_input message
+    AUDIO_BATCH_MAX_CHUNKS = 8
+
+    # Mic chunks kept while the sender is behind; the oldest are dropped first
+    AUDIO_INPUT_BUFFER_SIZE = 200
+
+    # realtime_input audio message split around its base64 payload; only the
+    # payload changes between chunks, so the rest is never re-serialized
+    AUDIO_MESSAGE_PREFIX = '{"realtime_input":{"media_chunks":[{"data":"'
+    AUDIO_MESSAGE_SUFFIX = '","mime_type":"audio/pcm;rate=16000;channels=1"}]}}'
+
+    SYSTEM_INSTRUCTION = "You are a helpful assistant. When reading order numbers, please read each digit individually, separated by pauses. For example, order #1234 should be read as 'order number one-two-three-four' rather than 'order number one thousand two hundred thirty-four'."
+
+    # Serialized static part of the setup message, keyed by the model id and
+    # system instruction it was built from; only the tools are encoded per
+    # session
+    _setup_message_prefixes = {}
+
     def __init__(
         self, api_key=None, model_id="gemini-2.0-flash-live-001", tool_handler=None
     ):
@@ -69,8 +86,12 @@ class GeminiLiveStreamManager:
         self.host = "generativelanguage.googleapis.com"
         self.ws_url = f"wss://{self.host}/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent?key={self.api_key}"
 
+        # Mic audio waiting to be sent, with an event to wake the sender
+        self.audio_input_buffer = deque(maxlen=self.AUDIO_INPUT_BUFFER_SIZE)
+        self.audio_input_ready = asyncio.Event()
+        self.dropped_audio_chunks = 0  # Chunks discarded due to a full buffer
+
         # Async queues for audio processing
-        self.audio_input_queue = asyncio.Queue()
         self.audio_output_queue = asyncio.Queue()
         self.output_queue = asyncio.Queue()
 
@@ -98,18 +119,13 @@ class GeminiLiveStreamManager:
             return self.tool_handler.get_gemini_tool_config()
         return []
 
-    async def initialize_stream(self):
-        """Initialize the bidirectional stream with Gemini Live API."""
-        try:
-            # Connect to WebSocket
-            self.websocket = await websockets.connect(
-                self.ws_url, additional_headers={"Content-Type": "application/json"}
-            )
-            self.is_active = True
-
-            # Send initial setup message
-            setup_message = {
-                "setup": {
+    def _setup_message_json(self):
+        """Build the setup message JSON, reusing the serialized static part."""
+        key = (self.model_id, self.SYSTEM_INSTRUCTION)
+        prefix = self._setup_message_prefixes.get(key)
+        if prefix is None:
+            static_setup = json.dumps(
+                {
                     "model": f"models/{self.model_id}",
                     "generation_config": {
                         "response_modalities": ["AUDIO", "TEXT"],
@@ -120,17 +136,27 @@ class GeminiLiveStreamManager:
                         },
                     },
                     "system_instruction": {
-                        "parts": [
-                            {
-                                "text": "You are a helpful assistant. When reading order numbers, please read each digit individually, separated by pauses. For example, order #1234 should be read as 'order number one-two-three-four' rather than 'order number one thousand two hundred thirty-four'."
-                            }
-                        ]
+                        "parts": [{"text": self.SYSTEM_INSTRUCTION}]
                     },
-                    "tools": self._get_tool_config(),
                 }
-            }
+            )
+            # Reopen the object so the tools can be appended
+            prefix = '{"setup": ' + static_setup[:-1] + ', "tools": '
+            self._setup_message_prefixes[key] = prefix
 
-            await self.websocket.send(json.dumps(setup_message))
+        return prefix + json.dumps(self._get_tool_config()) + "}}"
+
+    async def initialize_stream(self):
+        """Initialize the bidirectional stream with Gemini Live API."""
+        try:
+            # Connect to WebSocket
+            self.websocket = await websockets.connect(
+                self.ws_url, additional_headers={"Content-Type": "application/json"}
+            )
+            self.is_active = True
+
+            # Send initial setup message
+            await self.websocket.send(self._setup_message_json())
 
             # Wait for setup confirmation
             setup_response = await self.websocket.recv()
@@ -156,12 +182,15 @@ class GeminiLiveStreamManager:
 
     async def send_raw_message(self, message_dict):
         """Send a raw message dict to the Gemini Live API."""
+        await self.send_raw_json(json.dumps(message_dict))
+
+    async def send_raw_json(self, message_json):
+        """Send an already serialized JSON message to the Gemini Live API."""
         if not self.websocket or not self.is_active:
             debug_print("WebSocket not connected or stream closed")
             return
 
         try:
-            message_json = json.dumps(message_dict)
             await self.websocket.send(message_json)
             debug_print(f"Sent message: {message_json}")
         except Exception as e:
@@ -172,32 +201,35 @@ class GeminiLiveStreamManager:
         debug_print("Audio content started (handled automatically by Gemini Live)")
 
     async def _process_audio_input(self):
-        """Process audio input from the queue and send to Gemini Live."""
+        """Process audio input from the buffer and send to Gemini Live.
+
+        Chunks that queued up while the previous send was in flight are
+        concatenated into one message, so a backlog costs one WebSocket
+        frame instead of one per chunk. Nothing waits for more audio, so a
+        lone chunk is still sent immediately.
+        """
+        buffer = self.audio_input_buffer
         while self.is_active:
             try:
-                data = await self.audio_input_queue.get()
-
-                audio_bytes = data.get("audio_bytes")
-                if not audio_bytes:
-                    debug_print("No audio bytes received")
+                if not buffer:
+                    self.audio_input_ready.clear()
+                    await self.audio_input_ready.wait()
                     continue
 
-                # Base64 encode the audio data
-                audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
+                audio_bytes = b"".join(
+                    [
+                        buffer.popleft()
+                        for _ in range(min(len(buffer), self.AUDIO_BATCH_MAX_CHUNKS))
+                    ]
+                )
 
-                # Send audio message to Gemini Live with proper format
-                message = {
-                    "realtime_input": {
-                        "media_chunks": [
-                            {
-                                "data": audio_b64,
-                                "mime_type": "audio/pcm;rate=16000;channels=1",
-                            }
-                        ]
-                    }
-                }
+                # Base64 encode the audio data straight to a single-line str
+                audio_b64 = b2a_base64(audio_bytes, newline=False).decode("ascii")
 
-                await self.send_raw_message(message)
+                # Send audio message to Gemini Live with proper format
+                await self.send_raw_json(
+                    self.AUDIO_MESSAGE_PREFIX + audio_b64 + self.AUDIO_MESSAGE_SUFFIX
+                )
 
             except asyncio.CancelledError:
                 break
@@ -205,10 +237,20 @@ class GeminiLiveStreamManager:
                 debug_print(f"Error processing audio: {e}")
 
     def add_audio_chunk(self, audio_bytes):
-        """Add an audio chunk to the queue."""
-        self.audio_input_queue.put_nowait(
-            {"audio_bytes": audio_bytes, "session_id": self.session_id}
-        )
+        """Add an audio chunk to the input buffer."""
+        if not audio_bytes:
+            debug_print("No audio bytes received")
+            return
+        buffer = self.audio_input_buffer
+        if len(buffer) == buffer.maxlen:
+            # The deque evicts the oldest chunk on append; keep count of it
+            self.dropped_audio_chunks += 1
+            debug_print(
+                f"Audio input buffer full, dropped oldest chunk "
+                f"(total dropped: {self.dropped_audio_chunks})"
+            )
+        buffer.append(audio_bytes)
+        self.audio_input_ready.set()
 
     async def send_audio_content_end_event(self):
         """Send audio content end - handled automatically by Gemini Live"""
@@ -260,35 +302,15 @@ class GeminiLiveStreamManager:
                     raw_response = await self.websocket.recv()
                     response_data = json.loads(raw_response)
 
-                    # Handle setup completion
-                    if "setupComplete" in response_data:
+                    # Nearly every frame is serverContent (mostly audio), so
+                    # look it up first and only fall back to setupComplete
+                    server_content = response_data.get("serverContent")
+                    if server_content is not None:
+                        await self._handle_server_content(server_content)
+                    elif "setupComplete" in response_data:
                         debug_print("Setup completed successfully")
                         continue
 
-                    # Handle server content
-                    if "serverContent" in response_data:
-                        server_content = response_data["serverContent"]
-
-                        # Check for interruptions
-                        if server_content.get("interrupted"):
-                            debug_print("Response interrupted by user")
-                            self.barge_in = True
-                            # Clear audio output queue on interruption
-                            while not self.audio_output_queue.empty():
-                                try:
-                                    self.audio_output_queue.get_nowait()
-                                except asyncio.QueueEmpty:
-                                    break
-
-                        # Handle model turn responses
-                        if "modelTurn" in server_content:
-                            await self._handle_model_turn(server_content["modelTurn"])
-
-                        # Handle turn completion
-                        if server_content.get("turnComplete"):
-                            debug_print("Turn completed")
-                            self.barge_in = False
-
                     # Put response in output queue
                     await self.output_queue.put(response_data)
 
@@ -304,6 +326,35 @@ class GeminiLiveStreamManager:
         finally:
             self.is_active = False
 
+    async def _handle_server_content(self, server_content):
+        """Handle a serverContent message."""
+        model_turn = server_content.get("modelTurn")
+
+        # Fast path: a frame carrying only model output (usually audio)
+        if model_turn is not None and len(server_content) == 1:
+            await self._handle_model_turn(model_turn)
+            return
+
+        # Check for interruptions
+        if server_content.get("interrupted"):
+            debug_print("Response interrupted by user")
+            self.barge_in = True
+            # Clear audio output queue on interruption
+            while not self.audio_output_queue.empty():
+                try:
+                    self.audio_output_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+        # Handle model turn responses
+        if model_turn is not None:
+            await self._handle_model_turn(model_turn)
+
+        # Handle turn completion
+        if server_content.get("turnComplete"):
+            debug_print("Turn completed")
+            self.barge_in = False
+
     async def _handle_model_turn(self, model_turn):
         """Handle model turn responses."""
         for part in model_turn.get("parts", []):
@@ -323,7 +374,7 @@ class GeminiLiveStreamManager:
                 inline_data = part["inlineData"]
                 if inline_data.get("mimeType") == "audio/pcm":
                     audio_content = inline_data["data"]
-                    audio_bytes = base64.b64decode(audio_content)
+                    audio_bytes = a2b_base64(audio_content)
                     await self.audio_output_queue.put(audio_bytes)
 
             # Handle function calls
@@ -0,0 +1,49 @@
+"""
+JSON helpers for Strands Live.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so callers get the faster encoder without depending on it.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Types orjson doesn't handle (e.g. non-str keys) keep stdlib behaviour
+            pass
+    return json.dumps(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Deserialize JSON text or UTF-8 bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,13 +1,22 @@
-import json
-import uuid
+import re
+import secrets
+import sys
+from binascii import a2b_base64
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from .audio_streamer import AudioStreamer
 from .bedrock_streamer import BedrockStreamManager, debug_print, time_it_async
-from .context_builder import ContextBuilder, create_enhanced_system_prompt
+from .serialization import JSONDecodeError, dumps, loads
 from .tool_handler import ToolHandler
 
+if TYPE_CHECKING:
+    from .context_builder import ContextBuilder
+
+# Nova Sonic signals barge-in with an '{ "interrupted" : true }' text output;
+# match it regardless of the spacing around the colon
+_INTERRUPTED_RE = re.compile(r'"interrupted"\s*:\s*true')
+
 
 class SpeechAgent:
     """High-level speech agent that orchestrates audio streaming and bedrock communication."""
@@ -74,6 +83,8 @@ class SpeechAgent:
         self.custom_file_patterns = custom_file_patterns
         self.max_directory_depth = max_directory_depth
         self.max_files_listed = max_files_listed
+        self._context_builder = None
+        self._project_context = {}
 
         # Build enhanced system prompt with context
         enhanced_prompt = self._build_enhanced_system_prompt(system_prompt)
@@ -91,9 +102,9 @@ class SpeechAgent:
         self.audio_type = audio_type
 
         # State management
-        self.prompt_name = str(uuid.uuid4())
-        self.content_name = str(uuid.uuid4())
-        self.audio_content_name = str(uuid.uuid4())
+        self.prompt_name = secrets.token_hex(16)
+        self.content_name = secrets.token_hex(16)
+        self.audio_content_name = secrets.token_hex(16)
         self.display_assistant_text = False
         self.current_role = None
         self.barge_in = False
@@ -103,6 +114,16 @@ class SpeechAgent:
         self.current_tool_use_id = ""
         self.current_tool_name = ""
 
+        # Response event handlers keyed by event type; audioOutput is handled
+        # ahead of this table in handle_response_event
+        self._event_handlers = {
+            "contentStart": self._handle_content_start,
+            "textOutput": self._handle_text_output,
+            "toolUse": self._handle_tool_use,
+            "contentEnd": self._handle_content_end,
+            "completionEnd": self._handle_completion_end,
+        }
+
         # Initialize tool handler (use provided or default)
         self.tool_handler = tool_handler if tool_handler is not None else ToolHandler()
 
@@ -113,10 +134,113 @@ class SpeechAgent:
             tool_handler=self.tool_handler,
             agent=self,  # Pass reference so streamer can call back
         )
+        self.bedrock_stream_manager.configure_prompt(self.prompt_name)
 
         # Initialize audio streamer with agent reference
         self.audio_streamer = AudioStreamer(self.bedrock_stream_manager, agent=self)
 
+        # Settings the serialized session events were built from, see
+        # _get_session_events
+        self._session_events_key = None
+
+    def _get_session_events(self):
+        """Return the serialized session setup events, rebuilding them if needed.
+
+        They depend only on the configuration and the prompt/content names, so
+        they are reused until one of those attributes changes. The system
+        prompt text and the tool configuration are not included; they are
+        encoded when they are sent, so tools added before initialize() are
+        picked up.
+
+        Returns:
+            Tuple of (sessionStart, promptStart prefix, system contentStart,
+            system textInput prefix, system contentEnd)
+        """
+        key = (
+            self.max_tokens,
+            self.top_p,
+            self.temperature,
+            self.sample_rate_hz,
+            self.sample_size_bits,
+            self.channel_count,
+            self.voice_id,
+            self.audio_encoding,
+            self.audio_type,
+            self.prompt_name,
+            self.content_name,
+        )
+        if self._session_events_key != key:
+            self._session_events = self._build_session_events()
+            self._session_events_key = key
+        return self._session_events
+
+    def _build_session_events(self):
+        """Serialize the session setup events from the current configuration."""
+        session_start = dumps(
+            {
+                "event": {
+                    "sessionStart": {"inferenceConfiguration": self.get_inference_config()}
+                }
+            }
+        )
+        # promptStart split before its trailing toolConfiguration
+        prompt_start_prefix = dumps(
+            {
+                "event": {
+                    "promptStart": {
+                        "promptName": self.prompt_name,
+                        "textOutputConfiguration": {"mediaType": "text/plain"},
+                        "audioOutputConfiguration": self.get_audio_output_config(),
+                        "toolUseOutputConfiguration": {"mediaType": "application/json"},
+                        "toolConfiguration": None,
+                    }
+                }
+            }
+        )[: -len("null}}}")]
+        system_content_start = dumps(
+            {
+                "event": {
+                    "contentStart": {
+                        "promptName": self.prompt_name,
+                        "contentName": self.content_name,
+                        "type": "TEXT",
+                        "role": "SYSTEM",
+                        "interactive": True,
+                        "textInputConfiguration": {"mediaType": "text/plain"},
+                    }
+                }
+            }
+        )
+        # textInput split around its content so only the prompt text is encoded per send
+        system_text_input_prefix = dumps(
+            {
+                "event": {
+                    "textInput": {
+                        "promptName": self.prompt_name,
+                        "contentName": self.content_name,
+                        "content": "",
+                    }
+                }
+            }
+        )[: -len('""}}}')]
+        system_content_end = dumps(
+            {
+                "event": {
+                    "contentEnd": {
+                        "promptName": self.prompt_name,
+                        "contentName": self.content_name,
+                    }
+                }
+            }
+        )
+        return (
+            session_start,
+            prompt_start_prefix,
+            system_content_start,
+            system_text_input_prefix,
+            system_content_end,
+        )
+
     def get_inference_config(self):
         """Get inference configuration for the session."""
         return {
@@ -154,94 +278,47 @@ class SpeechAgent:
 
     async def _initialize_conversation(self):
         """Initialize the conversation with system prompt and configuration."""
-        # Send session start
-        session_start_event = {
-            "event": {
-                "sessionStart": {"inferenceConfiguration": self.get_inference_config()}
-            }
-        }
-        await self.bedrock_stream_manager.send_raw_event(
-            json.dumps(session_start_event)
-        )
-
-        # Send prompt start with configurations
-        prompt_start_event = {
-            "event": {
-                "promptStart": {
-                    "promptName": self.prompt_name,
-                    "textOutputConfiguration": {"mediaType": "text/plain"},
-                    "audioOutputConfiguration": self.get_audio_output_config(),
-                    "toolUseOutputConfiguration": {"mediaType": "application/json"},
-                    "toolConfiguration": self.get_tool_config(),
-                }
-            }
-        }
-        await self.bedrock_stream_manager.send_raw_event(json.dumps(prompt_start_event))
-
-        # Send system prompt
-        await self._send_system_prompt()
-
-    async def _send_system_prompt(self):
-        """Send the system prompt to establish context."""
-        # Content start for system message
-        system_content_start = {
-            "event": {
-                "contentStart": {
-                    "promptName": self.prompt_name,
-                    "contentName": self.content_name,
-                    "type": "TEXT",
-                    "role": "SYSTEM",
-                    "interactive": True,
-                    "textInputConfiguration": {"mediaType": "text/plain"},
-                }
-            }
-        }
-        await self.bedrock_stream_manager.send_raw_event(
-            json.dumps(system_content_start)
+        # Session start, prompt start and the system prompt go out as one batch
+        await self.bedrock_stream_manager.send_raw_events_batch(
+            [
+                self._get_session_events()[0],
+                self._prompt_start_event(),
+                *self._system_prompt_events(),
+            ]
         )
 
-        # System prompt content
-        system_content = {
-            "event": {
-                "textInput": {
-                    "promptName": self.prompt_name,
-                    "contentName": self.content_name,
-                    "content": self.system_prompt,
-                }
-            }
-        }
-        await self.bedrock_stream_manager.send_raw_event(json.dumps(system_content))
-
-        # Content end for system message
-        system_content_end = {
-            "event": {
-                "contentEnd": {
-                    "promptName": self.prompt_name,
-                    "contentName": self.content_name,
-                }
-            }
-        }
-        await self.bedrock_stream_manager.send_raw_event(json.dumps(system_content_end))
+    def _prompt_start_event(self):
+        """Return the promptStart event with the handler's current tool configuration."""
+        prompt_start_prefix = self._get_session_events()[1]
+        return prompt_start_prefix + dumps(self.get_tool_config()) + "}}}"
+
+    def _system_prompt_events(self):
+        """Return the contentStart/textInput/contentEnd events for the system prompt."""
+        _, _, content_start, text_input_prefix, content_end = self._get_session_events()
+        return [
+            content_start,
+            text_input_prefix + dumps(self.system_prompt) + "}}}",
+            content_end,
+        ]
 
     async def handle_response_event(self, json_data):
         """Handle response events from Bedrock stream."""
-        if "event" not in json_data:
+        event = json_data.get("event")
+        if event is None:
+            return
+
+        # audioOutput dominates while the model is speaking, check it first
+        audio_output = event.get("audioOutput")
+        if audio_output is not None:
+            await self._handle_audio_output(audio_output)
             return
 
-        event = json_data["event"]
-
-        if "contentStart" in event:
-            await self._handle_content_start(event["contentStart"])
-        elif "textOutput" in event:
-            await self._handle_text_output(event["textOutput"])
-        elif "audioOutput" in event:
-            await self._handle_audio_output(event["audioOutput"])
-        elif "toolUse" in event:
-            await self._handle_tool_use(event["toolUse"])
-        elif "contentEnd" in event:
-            await self._handle_content_end(event["contentEnd"])
-        elif "completionEnd" in event:
-            await self._handle_completion_end()
+        # Each event carries a single key naming its type
+        for event_type, payload in event.items():
+            handler = self._event_handlers.get(event_type)
+            if handler is not None:
+                await handler(payload)
+                return
 
     async def _handle_content_start(self, content_start):
         """Handle content start event."""
@@ -249,15 +326,20 @@ class SpeechAgent:
         self.current_role = content_start["role"]
 
         # Check for speculative content
-        if "additionalModelFields" in content_start:
+        additional_model_fields = content_start.get("additionalModelFields")
+        if additional_model_fields is not None:
+            # Most content isn't speculative; skip the parse when it can't be
+            if '"SPECULATIVE"' not in additional_model_fields:
+                self.display_assistant_text = False
+                return
             try:
-                additional_fields = json.loads(content_start["additionalModelFields"])
+                additional_fields = loads(additional_model_fields)
                 if additional_fields.get("generationStage") == "SPECULATIVE":
                     debug_print("Speculative content detected")
                     self.display_assistant_text = True
                 else:
                     self.display_assistant_text = False
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 debug_print("Error parsing additionalModelFields")
 
     async def _handle_text_output(self, text_output):
@@ -265,23 +347,22 @@ class SpeechAgent:
         text_content = text_output["content"]
         # role = text_output["role"]  # Currently unused, but may be needed for future features
 
-        # Check for barge-in
-        if '{ "interrupted" : true }' in text_content:
+        # Check for barge-in. The plain substring test rejects ordinary text
+        # in C; the regex only runs when the key is actually present
+        if '"interrupted"' in text_content and _INTERRUPTED_RE.search(text_content):
             debug_print("Barge-in detected. Stopping audio output.")
             self.barge_in = True
 
-        # Display text based on role and display settings
+        # Display text based on role and display settings. Each transcript
+        # entry goes out as one write instead of print's separate end write
         if self.current_role == "ASSISTANT" and self.display_assistant_text:
-            print(f"Assistant: {text_content}")
+            sys.stdout.write(f"Assistant: {text_content}\n")
         elif self.current_role == "USER":
-            print(f"\n----- USER -------\nUser: {text_content}\n\n")
+            sys.stdout.write(f"\n----- USER -------\nUser: {text_content}\n\n\n")
 
     async def _handle_audio_output(self, audio_output):
         """Handle audio output event."""
-        audio_content = audio_output["content"]
-        import base64
-
-        audio_bytes = base64.b64decode(audio_content)
+        audio_bytes = a2b_base64(audio_output["content"])
         await self.bedrock_stream_manager.audio_output_queue.put(audio_bytes)
 
     async def _handle_tool_use(self, tool_use):
@@ -299,9 +380,9 @@ class SpeechAgent:
             debug_print("Processing tool use and sending result")
             await self._execute_tool()
 
-    async def _handle_completion_end(self):
+    async def _handle_completion_end(self, completion_end=None):
         """Handle completion end event."""
-        print("End of response sequence")
+        debug_print("End of response sequence")
 
     async def _execute_tool(self):
         """Execute tool and send result back to stream."""
@@ -309,17 +390,14 @@ class SpeechAgent:
             tool_result = await self.tool_handler.process_tool_use(
                 self.current_tool_name, self.current_tool_use_content
             )
-            tool_content_name = str(uuid.uuid4())
-
-            # Send tool result through the stream manager
-            await self.bedrock_stream_manager.send_tool_start_event(
-                tool_content_name, self.current_tool_use_id, self.prompt_name
-            )
-            await self.bedrock_stream_manager.send_tool_result_event(
-                tool_content_name, tool_result, self.prompt_name
-            )
-            await self.bedrock_stream_manager.send_tool_content_end_event(
-                tool_content_name, self.prompt_name
+            tool_content_name = secrets.token_hex(16)
+
+            # Send tool start, result and end through the stream manager
+            await self.bedrock_stream_manager.send_tool_result_bundle(
+                tool_content_name,
+                self.current_tool_use_id,
+                tool_result,
+                self.prompt_name,
             )
         else:
             debug_print("No tool handler available")
@@ -367,24 +445,47 @@ class SpeechAgent:
             return base_prompt
         
         try:
-            # Create context builder
-            context_builder = ContextBuilder(self.working_directory)
-            
-            # Build enhanced prompt
-            enhanced_prompt = create_enhanced_system_prompt(
-                base_prompt=base_prompt,
-                context_builder=context_builder,
+            project_context = self._get_project_context()
+        except Exception as e:
+            print(f"Warning: Failed to build enhanced context: {e}")
+            return base_prompt
+
+        if project_context.strip():
+            return f"{base_prompt}\n\n{project_context}"
+        return base_prompt
+
+    def _get_context_builder(self) -> "ContextBuilder":
+        """Return the context builder for the working directory, creating it on first use."""
+        if self._context_builder is None:
+            # Imported here so agents without context never load the module
+            from .context_builder import ContextBuilder
+
+            self._context_builder = ContextBuilder(self.working_directory)
+        return self._context_builder
+
+    def _get_project_context(self) -> str:
+        """Return the project context for the current options.
+
+        The result is memoized per option set and only rebuilt after
+        refresh_context() drops it.
+        """
+        file_patterns = self.custom_file_patterns
+        cache_key = (
+            self.include_directory_structure,
+            self.include_project_files,
+            self.include_git_context,
+            tuple(file_patterns) if file_patterns is not None else None,
+        )
+        project_context = self._project_context.get(cache_key)
+        if project_context is None:
+            project_context = self._get_context_builder().build_full_context(
                 include_directory=self.include_directory_structure,
                 include_files=self.include_project_files,
                 include_git=self.include_git_context,
                 file_patterns=self.custom_file_patterns
             )
-            
-            return enhanced_prompt
-            
-        except Exception as e:
-            print(f"Warning: Failed to build enhanced context: {e}")
-            return base_prompt
+            self._project_context[cache_key] = project_context
+        return project_context
     
     def refresh_context(self) -> str:
         """Refresh the project context and return the updated system prompt.
@@ -395,6 +496,9 @@ class SpeechAgent:
         Returns:
             Updated system prompt with fresh context
         """
+        # Drop the memoized builder and context so files are read again
+        self._context_builder = None
+        self._project_context.clear()
         try:
             refreshed_prompt = self._build_enhanced_system_prompt()
             self.system_prompt = refreshed_prompt
@@ -420,7 +524,9 @@ class SpeechAgent:
             summary_parts.append("❌ Directory structure excluded")
             
         if self.include_project_files:
-            patterns = self.custom_file_patterns or ['README.md', 'AmazonQ.md', 'CHANGELOG.md', 'package.json', 'pyproject.toml']
+            from .context_builder import ContextBuilder
+
+            patterns = self.custom_file_patterns or ContextBuilder.DEFAULT_FILE_PATTERNS
             summary_parts.append(f"✅ Project files included: {', '.join(patterns)}")
         else:
             summary_parts.append("❌ Project files excluded")
@@ -439,12 +545,6 @@ class SpeechAgent:
             The raw context string that was appended to the system prompt
         """
         try:
-            context_builder = ContextBuilder(self.working_directory)
-            return context_builder.build_full_context(
-                include_directory=self.include_directory_structure,
-                include_files=self.include_project_files,
-                include_git=self.include_git_context,
-                file_patterns=self.custom_file_patterns
-            )
+            return self._get_project_context()
         except Exception as e:
             return f"Error generating context: {e}"
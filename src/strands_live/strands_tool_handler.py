@@ -5,12 +5,13 @@ acting as a proxy to the Strands ToolRegistry for seamless tool execution.
 """
 
 import asyncio
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from strands.tools.registry import ToolRegistry
 
+from .serialization import dumps, loads
 from .tool_handler_base import ToolHandlerBase
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,14 @@ class StrandsToolHandler(ToolHandlerBase):
         # Initialize Strands ToolRegistry
         self.registry = ToolRegistry()
 
+        # Dedicated, bounded pool for blocking tool.invoke() calls so tools
+        # don't compete with other work on the loop's default executor
+        self._tool_executor = ThreadPoolExecutor(
+            max_workers=self.get_config("tool_workers", 4),
+            thread_name_prefix="strands-tool",
+        )
+        self._closed = False
+
         # Register provided tools
         if self.tools:
             logger.info(
@@ -67,12 +76,20 @@ class StrandsToolHandler(ToolHandlerBase):
     def get_tool_schema(self, tool_name: str) -> dict[str, Any] | None:
         """Get schema for a specific tool.
 
+        Schemas of registered tools are cached until invalidate_tool_caches()
+        runs, which adding tools does, so callers must not modify the returned
+        dictionary. Unknown names are looked up again on every call.
+
         Args:
             tool_name: Name of the tool to get schema for.
 
         Returns:
             Tool schema dictionary or None if tool not found.
         """
+        schema = self._tool_schema_cache.get(tool_name)
+        if schema is not None:
+            return schema
+
         # Get tool config from Strands registry
         all_configs = self.registry.get_all_tools_config()
         config = all_configs.get(tool_name)
@@ -81,16 +98,20 @@ class StrandsToolHandler(ToolHandlerBase):
             logger.warning(f"Tool {tool_name} not found in Strands registry")
             return None
 
-        # Convert Strands format to our expected format
-        schema = {
+        logger.debug(f"Retrieved schema for tool {tool_name}")
+        schema = self._schema_from_config(config)
+        self._tool_schema_cache[tool_name] = schema
+        return schema
+
+    @staticmethod
+    def _schema_from_config(config: dict[str, Any]) -> dict[str, Any]:
+        """Convert a Strands tool config to our expected schema format."""
+        return {
             "name": config["name"],
             "description": config["description"],
             "parameters": config["inputSchema"]["json"],  # Already JSON schema format
         }
 
-        logger.debug(f"Retrieved schema for tool {tool_name}")
-        return schema
-
     async def process_tool_use(
         self, tool_name: str, parameters: dict[str, Any]
     ) -> dict[str, Any]:
@@ -104,7 +125,6 @@ class StrandsToolHandler(ToolHandlerBase):
             Dictionary containing execution result with status and content.
         """
         logger.debug(f"Processing tool use: {tool_name} with parameters: {parameters}")
-        print(f"\nTool Name: {tool_name}\nTool Params: {parameters}\n\n")
         # Get tool from registry
         tool = self.registry.registry.get(tool_name)
         if not tool:
@@ -117,13 +137,15 @@ class StrandsToolHandler(ToolHandlerBase):
             tool_use = {
                 "toolUseId": f"strands_tool_{tool_name}",
                 "name": tool_name,
-                "input": json.loads(parameters["content"]),
+                "input": loads(parameters["content"]),
             }
 
             # Execute tool in thread pool since tool.invoke() is synchronous
             # but our method is async
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, tool.invoke, tool_use)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._tool_executor, tool.invoke, tool_use
+            )
 
             # Convert Strands format to our format
             # Strands returns: {"toolUseId": "...", "status": "...", "content": [...]}
@@ -155,23 +177,31 @@ class StrandsToolHandler(ToolHandlerBase):
     def get_bedrock_tool_config(self) -> dict[str, Any]:
         """Get Bedrock-compatible tool configuration.
 
+        The configuration is cached until tools are added, so callers
+        must not modify the returned dictionary.
+
         Returns:
             Dictionary containing tools configuration for Bedrock.
         """
+        if self._bedrock_config_cache is not None:
+            return self._bedrock_config_cache
+
         tools = []
 
-        for tool_name in self.get_supported_tools():
-            schema = self.get_tool_schema(tool_name)
-            if schema:
+        # One registry scan for all tools rather than one per tool
+        all_configs = self.registry.get_all_tools_config()
+        for tool_name in self.registry.registry:
+            config = all_configs.get(tool_name)
+            if config:
                 # Convert to Bedrock format
                 bedrock_tool = {
                     "toolSpec": {
-                        "name": schema["name"],
-                        "description": schema["description"],
+                        "name": config["name"],
+                        "description": config["description"],
                         "inputSchema": {
-                            "json": json.dumps(
+                            "json": dumps(
                                 self._convert_schema_to_bedrock_format(
-                                    schema["parameters"]
+                                    config["inputSchema"]["json"]
                                 )
                             )
                         },
@@ -179,7 +209,8 @@ class StrandsToolHandler(ToolHandlerBase):
                 }
                 tools.append(bedrock_tool)
 
-        return {"tools": tools}
+        self._bedrock_config_cache = {"tools": tools}
+        return self._bedrock_config_cache
 
     def add_strands_tool(self, tool_function) -> str:
         """Add a new Strands tool to the handler.
@@ -199,6 +230,7 @@ class StrandsToolHandler(ToolHandlerBase):
             )
 
         tool_names = self.registry.process_tools([tool_function])
+        self.invalidate_tool_caches()
         if tool_names:
             tool_name = tool_names[0]
             logger.info(f"Added Strands tool: {tool_name}")
@@ -216,9 +248,20 @@ class StrandsToolHandler(ToolHandlerBase):
             List of names of the added tools.
         """
         tool_names = self.registry.process_tools(tool_functions)
+        self.invalidate_tool_caches()
         logger.info(f"Added Strands tools: {tool_names}")
         return tool_names
 
+    def close(self) -> None:
+        """Shut down the tool execution thread pool.
+
+        Safe to call more than once; tools can't be invoked afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._tool_executor.shutdown(wait=False)
+
     def get_handler_info(self) -> dict[str, Any]:
         """Get handler information including registered tools.
 
@@ -1,13 +1,29 @@
+import bisect
 import datetime
 import hashlib
-import json
+import itertools
+import math
 import random
+import time
+from types import MappingProxyType
 from typing import Any
 
 import pytz
 
+from .serialization import JSONDecodeError, loads
 from .tool_handler_base import ToolHandlerBase
 
+# Indexed by date.weekday(); avoids a strftime("%A").upper() per call
+_WEEKDAY_NAMES = (
+    "MONDAY",
+    "TUESDAY",
+    "WEDNESDAY",
+    "THURSDAY",
+    "FRIDAY",
+    "SATURDAY",
+    "SUNDAY",
+)
+
 
 class ToolHandler(ToolHandlerBase):
     """
@@ -19,58 +35,12 @@ class ToolHandler(ToolHandlerBase):
     - Extensible architecture for adding new tools
     """
 
-    def _initialize_handler(self) -> None:
-        """Initialize the default tool handler."""
-        # Set default timezone if not configured
-        if "timezone" not in self.config:
-            self.config["timezone"] = "America/Los_Angeles"
-
-        # Set default order statuses if not configured
-        if "order_statuses" not in self.config:
-            self.config["order_statuses"] = [
-                "Order received",
-                "Processing",
-                "Preparing for shipment",
-                "Shipped",
-                "In transit",
-                "Out for delivery",
-                "Delivered",
-                "Delayed",
-            ]
-
-        # Set default status weights if not configured
-        if "status_weights" not in self.config:
-            self.config["status_weights"] = [10, 15, 15, 20, 20, 10, 5, 3]
+    # Tool names and schemas are static, so they are built once per class.
+    # The schema mapping is read-only; get_tool_schema hands out shared dicts
+    SUPPORTED_TOOLS = ("getDateAndTimeTool", "trackOrderTool")
 
-    async def process_tool_use(
-        self, tool_name: str, tool_use_content: dict[str, Any]
-    ) -> dict[str, Any]:
-        """Process tool use request and return the result."""
-        # Validate the request first
-        if not await self.validate_tool_request(tool_name, tool_use_content):
-            return await self.handle_tool_error(
-                tool_name, ValueError("Invalid tool request")
-            )
-
-        try:
-            tool = tool_name.lower()
-
-            if tool == "getdateandtimetool":
-                return await self._get_date_and_time()
-            elif tool == "trackordertool":
-                return await self._track_order(tool_use_content)
-            else:
-                return {"error": f"Unknown tool: {tool_name}", "toolName": tool_name}
-        except Exception as e:
-            return await self.handle_tool_error(tool_name, e)
-
-    def get_supported_tools(self) -> list[str]:
-        """Get list of supported tools."""
-        return ["getDateAndTimeTool", "trackOrderTool"]
-
-    def get_tool_schema(self, tool_name: str) -> dict[str, Any] | None:
-        """Get the schema for a specific tool."""
-        schemas = {
+    TOOL_SCHEMAS = MappingProxyType(
+        {
             "getdateandtimetool": {
                 "name": "getDateAndTimeTool",
                 "description": "Get information about the current date and time",
@@ -112,32 +82,160 @@ class ToolHandler(ToolHandlerBase):
                 },
             },
         }
+    )
+
+    # Lowercased tool name -> handler(self, tool_use_content). Methods are
+    # looked up on the instance at call time so overrides still apply
+    TOOL_DISPATCH = MappingProxyType(
+        {
+            "getdateandtimetool": lambda self, content: self._get_date_and_time(),
+            "trackordertool": lambda self, content: self._track_order(content),
+        }
+    )
 
-        return schemas.get(tool_name.lower())
+    def _initialize_handler(self) -> None:
+        """Initialize the default tool handler."""
+        # Set default timezone if not configured
+        if "timezone" not in self.config:
+            self.config["timezone"] = "America/Los_Angeles"
 
-    async def _get_date_and_time(self) -> dict[str, Any]:
-        """Get current date and time in configured timezone."""
-        timezone_name = self.get_config("timezone", "America/Los_Angeles")
-        timezone = pytz.timezone(timezone_name)
-        current_time = datetime.datetime.now(timezone)
+        # Set default order statuses if not configured
+        if "order_statuses" not in self.config:
+            self.config["order_statuses"] = [
+                "Order received",
+                "Processing",
+                "Preparing for shipment",
+                "Shipped",
+                "In transit",
+                "Out for delivery",
+                "Delivered",
+                "Delayed",
+            ]
+
+        # Set default status weights if not configured
+        if "status_weights" not in self.config:
+            self.config["status_weights"] = [10, 15, 15, 20, 20, 10, 5, 3]
 
-        return {
+        # (name, pytz timezone, abbreviation), see _get_timezone
+        self._timezone_cache: tuple[str, Any, str] | None = None
+        # (timezone, computed at, valid until, result), see _get_date_and_time
+        self._date_time_cache: tuple[Any, float, float, dict[str, Any]] | None = None
+        # (status_weights, cumulative weights), see _get_cum_weights
+        self._cum_weights_cache: tuple[tuple[float, ...], list[float]] | None = None
+
+    async def process_tool_use(
+        self, tool_name: str, tool_use_content: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Process tool use request and return the result."""
+        # Decode JSON string content once; validation and the tools both
+        # accept the already-parsed form
+        tool_use_content = self._decode_content(tool_use_content)
+        tool = tool_name.lower()
+
+        # Validate the request first. Unless a subclass overrides the hook,
+        # run the checks inline with the already-lowercased name
+        if type(self).validate_tool_request is ToolHandler.validate_tool_request:
+            valid = self._is_valid_request(tool, tool_use_content)
+        else:
+            valid = await self.validate_tool_request(tool_name, tool_use_content)
+        if not valid:
+            return await self.handle_tool_error(
+                tool_name, ValueError("Invalid tool request")
+            )
+
+        try:
+            handler = self.TOOL_DISPATCH.get(tool)
+            if handler is None:
+                return {"error": f"Unknown tool: {tool_name}", "toolName": tool_name}
+            # The built-in tools are CPU-only and run synchronously
+            return handler(self, tool_use_content)
+        except Exception as e:
+            return await self.handle_tool_error(tool_name, e)
+
+    @staticmethod
+    def _decode_content(tool_use_content: dict[str, Any]) -> dict[str, Any]:
+        """Return tool_use_content with a JSON string "content" parsed.
+
+        The input is left as-is when there is no string content or it is not
+        valid JSON, so validation still rejects it.
+        """
+        content = tool_use_content.get("content")
+        if not isinstance(content, str) or not content:
+            return tool_use_content
+        try:
+            return {**tool_use_content, "content": loads(content)}
+        except JSONDecodeError:
+            return tool_use_content
+
+    def get_supported_tools(self) -> list[str]:
+        """Get list of supported tools."""
+        return list(self.SUPPORTED_TOOLS)
+
+    def get_tool_schema(self, tool_name: str) -> dict[str, Any] | None:
+        """Get the schema for a specific tool."""
+        return self.TOOL_SCHEMAS.get(tool_name.lower())
+
+    def _get_date_and_time(self) -> dict[str, Any]:
+        """Get current date and time in configured timezone.
+
+        The finest field is the minute, so a result is reused until the next
+        minute boundary as long as the timezone is unchanged.
+        """
+        timezone, timezone_abbrev = self._get_timezone()
+        now = time.time()
+        cached = self._date_time_cache
+        if (
+            cached is not None
+            and cached[0] is timezone
+            and cached[1] <= now < cached[2]
+        ):
+            return dict(cached[3])
+
+        current_time = datetime.datetime.fromtimestamp(now, timezone)
+        result = {
             "formattedTime": current_time.strftime("%I:%M %p"),
-            "date": current_time.strftime("%Y-%m-%d"),
+            "date": current_time.date().isoformat(),
             "year": current_time.year,
             "month": current_time.month,
             "day": current_time.day,
-            "dayOfWeek": current_time.strftime("%A").upper(),
-            "timezone": timezone_name.split("/")[-1],  # Extract timezone abbreviation
+            "dayOfWeek": _WEEKDAY_NAMES[current_time.weekday()],
+            "timezone": timezone_abbrev,
         }
+        self._date_time_cache = (timezone, now, now - now % 60 + 60, result)
+        return dict(result)
+
+    def _get_cum_weights(self) -> list[float]:
+        """Return cumulative status weights for random.choices.
+
+        Keyed on the weight values, so the result is recomputed when the
+        configured list is replaced or modified in place.
+        """
+        weights = tuple(self.get_config("status_weights"))
+        if self._cum_weights_cache is None or self._cum_weights_cache[0] != weights:
+            self._cum_weights_cache = (weights, list(itertools.accumulate(weights)))
+        return self._cum_weights_cache[1]
+
+    def _get_timezone(self) -> tuple[Any, str]:
+        """Return the configured timezone and its abbreviation.
+
+        The pytz lookup is cached until the configured timezone name changes.
+        """
+        timezone_name = self.get_config("timezone", "America/Los_Angeles")
+        if self._timezone_cache is None or self._timezone_cache[0] != timezone_name:
+            self._timezone_cache = (
+                timezone_name,
+                pytz.timezone(timezone_name),
+                timezone_name.split("/")[-1],  # Extract timezone abbreviation
+            )
+        return self._timezone_cache[1], self._timezone_cache[2]
 
-    async def _track_order(self, tool_use_content: dict[str, Any]) -> dict[str, Any]:
+    def _track_order(self, tool_use_content: dict[str, Any]) -> dict[str, Any]:
         """Track order status with deterministic fake data."""
         # Extract order ID - handle both old and new formats
         if "content" in tool_use_content:
             # Old format - content contains JSON string
             content = tool_use_content.get("content", {})
-            content_data = json.loads(content) if isinstance(content, str) else content
+            content_data = loads(content) if isinstance(content, str) else content
             order_id = content_data.get("orderId", "")
             request_notifications = tool_use_content.get("requestNotifications", False)
         else:
@@ -160,37 +258,46 @@ class ToolHandler(ToolHandlerBase):
 
         # Create deterministic randomness based on order ID
         # This ensures the same order ID always returns the same status
-        seed = (
-            int(hashlib.md5(order_id.encode(), usedforsecurity=False).hexdigest(), 16)
-            % 10000
-        )
-        random.seed(seed)
+        # Same value as parsing the hexdigest, without the hex round-trip
+        digest = hashlib.md5(order_id.encode(), usedforsecurity=False).digest()
+        seed = int.from_bytes(digest, "big") % 10000
+        # A private generator leaves the global random state untouched, so
+        # concurrent calls can't reseed each other
+        rng = random.Random(seed)
 
         # Get configured statuses and weights
         statuses = self.get_config("order_statuses")
-        weights = self.get_config("status_weights")
 
-        # Select a status based on the weights
-        status = random.choices(statuses, weights=weights, k=1)[0]
+        # Select a status based on the weights. Same draw as
+        # rng.choices(statuses, cum_weights=..., k=1)[0] without the list
+        cum_weights = self._get_cum_weights()
+        if len(cum_weights) != len(statuses):
+            raise ValueError("The number of weights does not match the population")
+        total = cum_weights[-1]
+        if total <= 0.0:
+            raise ValueError("Total of weights must be greater than zero")
+        if not math.isfinite(total):
+            raise ValueError("Total of weights must be finite")
+        index = bisect.bisect(
+            cum_weights, rng.random() * total, 0, len(cum_weights) - 1
+        )
+        status = statuses[index]
 
         # Generate a realistic estimated delivery date
-        today = datetime.datetime.now()
         # Handle estimated delivery date based on status
         if status == "Delivered":
             # For delivered items, delivery date is in the past
-            delivery_days = -random.randint(0, 3)
-            estimated_delivery = (
-                today + datetime.timedelta(days=delivery_days)
-            ).strftime("%Y-%m-%d")
+            delivery_days = -rng.randint(0, 3)
         elif status == "Out for delivery":
             # For out for delivery, delivery is today
-            estimated_delivery = today.strftime("%Y-%m-%d")
+            delivery_days = 0
         else:
             # For other statuses, delivery is in the future
-            delivery_days = random.randint(1, 10)
-            estimated_delivery = (
-                today + datetime.timedelta(days=delivery_days)
-            ).strftime("%Y-%m-%d")
+            delivery_days = rng.randint(1, 10)
+        # One clock read and date-only arithmetic; isoformat() is %Y-%m-%d
+        estimated_delivery = (
+            datetime.date.today() + datetime.timedelta(days=delivery_days)
+        ).isoformat()
 
         # Handle notification request if enabled
         notification_message = ""
@@ -230,13 +337,16 @@ class ToolHandler(ToolHandlerBase):
         self, tool_name: str, tool_use_content: dict[str, Any]
     ) -> bool:
         """Validate tool request with additional checks for specific tools."""
-        # First do base validation
-        if not await super().validate_tool_request(tool_name, tool_use_content):
+        return self._is_valid_request(tool_name.lower(), tool_use_content)
+
+    def _is_valid_request(self, tool: str, tool_use_content: dict[str, Any]) -> bool:
+        """Synchronous body of validate_tool_request for a lowercased tool name."""
+        # Base validation is only the supported-tool check; call it directly
+        # rather than awaiting the parent coroutine
+        if not self.is_tool_supported(tool):
             return False
 
         # Additional validation for specific tools
-        tool = tool_name.lower()
-
         if tool == "trackordertool":
             # Handle both old and new formats
             if "content" in tool_use_content:
@@ -247,11 +357,11 @@ class ToolHandler(ToolHandlerBase):
 
                 try:
                     content_data = (
-                        json.loads(content) if isinstance(content, str) else content
+                        loads(content) if isinstance(content, str) else content
                     )
                     if not content_data.get("orderId"):
                         return False
-                except (json.JSONDecodeError, AttributeError):
+                except (JSONDecodeError, AttributeError):
                     return False
             else:
                 # New format - validate direct parameters
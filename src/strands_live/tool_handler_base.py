@@ -1,7 +1,8 @@
-import json
 from abc import ABC, abstractmethod
 from typing import Any
 
+from .serialization import dumps
+
 
 class ToolHandlerBase(ABC):
     """
@@ -20,6 +21,12 @@ class ToolHandlerBase(ABC):
             config: Optional configuration dictionary for the tool handler
         """
         self.config = config or {}
+        # Built on first use and dropped by invalidate_tool_caches()
+        self._bedrock_config_cache: dict[str, Any] | None = None
+        self._supported_lower: frozenset[str] | None = None
+        # Schemas of known tools for implementations whose lookup is expensive;
+        # misses aren't stored, so unknown names can't grow it
+        self._tool_schema_cache: dict[str, dict[str, Any]] = {}
         self._initialize_handler()
 
     @abstractmethod
@@ -84,9 +91,23 @@ class ToolHandlerBase(ABC):
         Returns:
             True if the tool is supported, False otherwise
         """
-        return tool_name.lower() in [
-            tool.lower() for tool in self.get_supported_tools()
-        ]
+        return tool_name.lower() in self._get_supported_lower()
+
+    def _get_supported_lower(self) -> frozenset[str]:
+        """
+        Get the lowercased supported tool names, building them on first use.
+
+        Concurrent first calls may both build the set; the results are equal
+        and the assignment is atomic, so no lock is needed.
+
+        Returns:
+            Frozenset of lowercased tool names
+        """
+        if self._supported_lower is None:
+            self._supported_lower = frozenset(
+                tool.lower() for tool in self.get_supported_tools()
+            )
+        return self._supported_lower
 
     def get_config(self, key: str, default: Any = None) -> Any:
         """
@@ -110,6 +131,20 @@ class ToolHandlerBase(ABC):
             value: The value to set
         """
         self.config[key] = value
+        self.invalidate_tool_caches()
+
+    def invalidate_tool_caches(self) -> None:
+        """
+        Drop the cached supported tool set, tool schemas and Bedrock tool
+        configuration.
+
+        set_config calls this. Implementations whose tools or schemas change
+        after initialization, and code that edits ``self.config`` directly,
+        must call it so the next lookup rebuilds them.
+        """
+        self._bedrock_config_cache = None
+        self._supported_lower = None
+        self._tool_schema_cache.clear()
 
     def get_handler_info(self) -> dict[str, Any]:
         """
@@ -121,7 +156,7 @@ class ToolHandlerBase(ABC):
         return {
             "handler_type": self.__class__.__name__,
             "supported_tools": self.get_supported_tools(),
-            "config_keys": list(self.config.keys()),
+            "config_keys": list(self.config),
             "description": self.__class__.__doc__ or "No description available",
         }
 
@@ -172,10 +207,16 @@ class ToolHandlerBase(ABC):
         """
         Get tool configuration in Bedrock-compatible format.
 
+        The configuration is built once and cached until the configuration
+        changes, so callers must not modify the returned dictionary.
+
         Returns:
             Dictionary containing Bedrock-compatible tool configuration with:
             - tools: List of tool specifications for Bedrock
         """
+        if self._bedrock_config_cache is not None:
+            return self._bedrock_config_cache
+
         tools = []
 
         for tool_name in self.get_supported_tools():
@@ -187,7 +228,7 @@ class ToolHandlerBase(ABC):
                         "name": schema["name"],
                         "description": schema["description"],
                         "inputSchema": {
-                            "json": json.dumps(
+                            "json": dumps(
                                 self._convert_schema_to_bedrock_format(
                                     schema.get("parameters", {})
                                 )
@@ -197,7 +238,8 @@ class ToolHandlerBase(ABC):
                 }
                 tools.append(bedrock_tool)
 
-        return {"tools": tools}
+        self._bedrock_config_cache = {"tools": tools}
+        return self._bedrock_config_cache
 
     def _convert_schema_to_bedrock_format(
         self, parameters_schema: dict[str, Any]
@@ -35,6 +35,7 @@ print(result["content"][0]["text"])  # Prints the response text
 See the use_llm function docstring for more details on available specialties.
 """
 
+import importlib
 import logging
 from typing import Any
 
@@ -42,35 +43,6 @@ from strands import Agent
 from strands.telemetry.metrics import metrics_to_string
 from strands.types.tools import ToolResult, ToolUse
 
-# Strands tools
-from strands_tools import (
-    agent_graph,
-    calculator,
-    cron,
-    current_time,
-    editor,
-    environment,
-    file_read,
-    file_write,
-    generate_image,
-    http_request,
-    image_reader,
-    journal,
-    load_tool,
-    memory,
-    nova_reels,
-    python_repl,
-    retrieve,
-    shell,
-    slack,
-    speak,
-    stop,
-    swarm,
-    think,
-    use_aws,
-    workflow,
-)
-
 logger = logging.getLogger(__name__)
 PROMPT_APPENDED_TEXT = "Make sure to return short and concise answers. It should respond to user question, nothing else!"
 # Agent specialty system prompts
@@ -83,6 +55,12 @@ AGENT_SPECIALTIES = {
     "general": "You are a knowledgeable and helpful assistant. You provide accurate, comprehensive answers across a wide range of topics. You're resourceful, think step-by-step, and use available tools effectively to solve problems.",
 }
 
+# Full system prompt per specialty, joined once at import
+_AGENT_SYSTEM_PROMPTS = {
+    specialty: prompt + PROMPT_APPENDED_TEXT
+    for specialty, prompt in AGENT_SPECIALTIES.items()
+}
+
 TOOL_SPEC = {
     "name": "use_llm",
     "description": "Communicate with powerful specialized AI agents that have access to comprehensive toolkits. If you don't know how to answer a user's request or need expert assistance, ALWAYS use this tool to delegate to specialized agents with different expertise areas. These agents can access internet, user's files and user's AWS account. Use these agents to access this information.",
@@ -177,39 +155,10 @@ def use_llm(tool: ToolUse, **kwargs: Any) -> ToolResult:
     agent_specialty = tool_input.get("agent_specialty", "general")
 
     # Get system prompt for the specified specialty
-    system_prompt = (
-        AGENT_SPECIALTIES.get(agent_specialty, AGENT_SPECIALTIES["general"])
-        + PROMPT_APPENDED_TEXT
+    system_prompt = _AGENT_SYSTEM_PROMPTS.get(
+        agent_specialty, _AGENT_SYSTEM_PROMPTS["general"]
     )
 
-    tools = [
-        agent_graph,
-        calculator,
-        cron,
-        current_time,
-        editor,
-        environment,
-        file_read,
-        file_write,
-        generate_image,
-        http_request,
-        image_reader,
-        journal,
-        load_tool,
-        memory,
-        nova_reels,
-        python_repl,
-        retrieve,
-        shell,
-        slack,
-        speak,
-        stop,
-        swarm,
-        think,
-        use_aws,
-        use_llm,
-        workflow,
-    ]
     trace_attributes = {}
 
     extra_kwargs = {}
@@ -230,7 +179,7 @@ def use_llm(tool: ToolUse, **kwargs: Any) -> ToolResult:
     # Initialize the new Agent with specialized system prompt
     agent = Agent(
         messages=[],
-        tools=tools,
+        tools=list(_load_specialist_tools()),
         system_prompt=system_prompt,
         trace_attributes=trace_attributes,
         **extra_kwargs,
@@ -259,3 +208,53 @@ def use_llm(tool: ToolUse, **kwargs: Any) -> ToolResult:
             {"text": f"Metrics: {metrics_text}"},
         ],
     }
+
+
+# strands_tools modules handed to every specialist agent, in order. They pull
+# in heavy dependencies (AWS SDK, HTTP clients, PIL), so they are imported on
+# the first delegated call rather than when this module loads. "use_llm"
+# refers to the function above.
+_SPECIALIST_TOOL_NAMES = (
+    "agent_graph",
+    "calculator",
+    "cron",
+    "current_time",
+    "editor",
+    "environment",
+    "file_read",
+    "file_write",
+    "generate_image",
+    "http_request",
+    "image_reader",
+    "journal",
+    "load_tool",
+    "memory",
+    "nova_reels",
+    "python_repl",
+    "retrieve",
+    "shell",
+    "slack",
+    "speak",
+    "stop",
+    "swarm",
+    "think",
+    "use_aws",
+    "use_llm",
+    "workflow",
+)
+_SPECIALIST_TOOLS_CACHE: tuple[Any, ...] | None = None
+
+
+def _load_specialist_tools() -> tuple[Any, ...]:
+    """Import the specialist tools on first use and return them."""
+    global _SPECIALIST_TOOLS_CACHE
+    if _SPECIALIST_TOOLS_CACHE is None:
+        _SPECIALIST_TOOLS_CACHE = tuple(
+            (
+                use_llm
+                if name == "use_llm"
+                else importlib.import_module(f"strands_tools.{name}")
+            )
+            for name in _SPECIALIST_TOOL_NAMES
+        )
+    return _SPECIALIST_TOOLS_CACHE
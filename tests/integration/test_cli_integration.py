@@ -8,12 +8,12 @@ testing real component interactions without requiring AWS credentials.
 import os
 import subprocess
 import sys
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 from strands_tools import calculator, current_time
 
-from strands_live.cli import async_main, get_default_tools, run_cli
+from strands_live.cli import async_main, build_arg_parser, get_default_tools, run_cli
 from strands_live.speech_agent import SpeechAgent
 from strands_live.strands_tool_handler import StrandsToolHandler
 from strands_live.tool_handler import ToolHandler
@@ -22,15 +22,15 @@ from strands_live.tool_handler import ToolHandler
 class TestCLIIntegration:
     """Integration tests for CLI functionality."""
 
-    def test_cli_help_message(self):
+    def test_cli_help_message(self, capsys):
         """Test that CLI help message shows all expected options."""
-        result = subprocess.run(
-            [sys.executable, "main.py", "--help"], capture_output=True, text=True
-        )
+        with pytest.raises(SystemExit) as exc_info:
+            build_arg_parser().parse_args(["--help"])
 
-        assert result.returncode == 0
-        assert "--debug" in result.stdout
-        assert "Strands Live Speech Agent with Context Gathering" in result.stdout
+        stdout = capsys.readouterr().out
+        assert exc_info.value.code == 0
+        assert "--debug" in stdout
+        assert "Strands Live Speech Agent with Context Gathering" in stdout
 
     @patch("strands_live.cli.SpeechAgent")
     @patch("strands_live.cli.StrandsToolHandler")
@@ -40,12 +40,11 @@ class TestCLIIntegration:
     ):
         """Test that main() uses StrandsToolHandler by default."""
         # Setup mocks
-        mock_strands_instance = Mock()
+        mock_strands_instance = Mock(spec=StrandsToolHandler)
         mock_strands_handler.return_value = mock_strands_instance
 
-        mock_agent_instance = Mock()
-        mock_agent_instance.initialize = AsyncMock()
-        mock_agent_instance.start_conversation = AsyncMock()
+        # Spec'd so initialize/start_conversation are AsyncMocks already
+        mock_agent_instance = Mock(spec=SpeechAgent)
         mock_speech_agent.return_value = mock_agent_instance
 
         # Test default behavior
@@ -53,11 +52,8 @@ class TestCLIIntegration:
 
         # Verify StrandsToolHandler was used with tools
         mock_strands_handler.assert_called_once()
-        call_args = mock_strands_handler.call_args
-        assert "tools" in call_args.kwargs
-        assert (
-            len(call_args.kwargs["tools"]) == 3
-        )  # current_time, calculator, and use_llm
+        tools_arg = mock_strands_handler.call_args.kwargs["tools"]
+        assert len(tools_arg) == 3  # current_time, calculator, and use_llm
 
         # Verify SpeechAgent was created with Strands handler and default context params
         mock_speech_agent.assert_called_once_with(
@@ -82,12 +78,10 @@ class TestCLIIntegration:
     ):
         """Test that main() uses custom tools when provided."""
         # Setup mocks
-        mock_strands_instance = Mock()
+        mock_strands_instance = Mock(spec=StrandsToolHandler)
         mock_strands_handler.return_value = mock_strands_instance
 
-        mock_agent_instance = Mock()
-        mock_agent_instance.initialize = AsyncMock()
-        mock_agent_instance.start_conversation = AsyncMock()
+        mock_agent_instance = Mock(spec=SpeechAgent)
         mock_speech_agent.return_value = mock_agent_instance
 
         # Create custom tools
@@ -98,9 +92,7 @@ class TestCLIIntegration:
 
         # Verify StrandsToolHandler was used with custom tools
         mock_strands_handler.assert_called_once()
-        call_args = mock_strands_handler.call_args
-        assert "tools" in call_args.kwargs
-        assert call_args.kwargs["tools"] == custom_tools
+        assert mock_strands_handler.call_args.kwargs["tools"] == custom_tools
 
         # Verify SpeechAgent was created with Strands handler and default context params
         mock_speech_agent.assert_called_once_with(
@@ -250,23 +242,6 @@ class TestEndToEndIntegration:
         assert current_time in tools
         assert calculator in tools
 
-    @patch.dict(os.environ, {}, clear=True)
-    def test_cli_runs_without_aws_credentials(self):
-        """Test that CLI handles missing AWS credentials gracefully."""
-        # This should fail with AWS credential error, not import/setup errors
-        result = subprocess.run(
-            [
-                sys.executable,
-                "-c",
-                "from strands_live.cli import async_main; print('CLI imports successful')",
-            ],
-            capture_output=True,
-            text=True,
-        )
-
-        assert result.returncode == 0
-        assert "CLI imports successful" in result.stdout
-
     def test_cli_argument_parsing(self):
         """Test CLI argument parsing with various combinations."""
         test_cases = [
@@ -274,25 +249,26 @@ class TestEndToEndIntegration:
             (["--debug", "--help"], 0),
         ]
 
+        parser = build_arg_parser()
         for args, expected_code in test_cases:
-            result = subprocess.run(
-                [sys.executable, "main.py"] + args, capture_output=True, text=True
-            )
-            assert result.returncode == expected_code, f"Failed for args: {args}"
+            with pytest.raises(SystemExit) as exc_info:
+                parser.parse_args(args)
+            assert exc_info.value.code == expected_code, f"Failed for args: {args}"
+
+        args = parser.parse_args(["--debug", "--max-depth", "3"])
+        assert args.debug is True
+        assert args.max_depth == 3
 
     @patch("strands_live.cli.SpeechAgent")
     @patch("strands_live.cli.StrandsToolHandler")
     def test_cli_configuration_flow(self, mock_strands_handler, mock_speech_agent):
         """Test the complete CLI configuration flow."""
         # Setup mocks
-        mock_strands_instance = Mock()
+        mock_strands_instance = Mock(spec=StrandsToolHandler)
         mock_strands_handler.return_value = mock_strands_instance
 
-        mock_agent_instance = Mock()
-        mock_agent_instance.initialize = AsyncMock()
-        mock_agent_instance.start_conversation = AsyncMock(
-            side_effect=KeyboardInterrupt
-        )
+        mock_agent_instance = Mock(spec=SpeechAgent)
+        mock_agent_instance.start_conversation.side_effect = KeyboardInterrupt
         mock_speech_agent.return_value = mock_agent_instance
 
         # Test CLI with different argument combinations
@@ -344,10 +320,13 @@ class TestEndToEndIntegration:
         assert len(lines) > 0
 
     def test_main_py_exists_and_runnable(self):
-        """Test that main.py exists and can be imported."""
+        """Test that main.py and the CLI import cleanly without AWS credentials."""
         assert os.path.exists("main.py")
+        env = {
+            key: value for key, value in os.environ.items() if not key.startswith("AWS_")
+        }
 
-        # Test that it can be imported without errors
+        # Test that it can be imported without errors; main.py imports strands_live.cli
         result = subprocess.run(
             [
                 sys.executable,
@@ -356,6 +335,7 @@ class TestEndToEndIntegration:
             ],
             capture_output=True,
             text=True,
+            env=env,
         )
 
         # Should not have import errors
@@ -2,65 +2,73 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from strands_live import audio_streamer as audio_streamer_module
 from strands_live.audio_streamer import AudioStreamer
+from strands_live.bedrock_streamer import BedrockStreamManager
+from strands_live.speech_agent import SpeechAgent
 
 
 class TestAudioStreamer:
     """Test cases for the AudioStreamer class."""
 
-    @patch("strands_live.audio_streamer.pyaudio.PyAudio")
-    @patch("asyncio.get_event_loop")
-    def test_initialization(self, mock_get_event_loop, mock_pyaudio):
-        """Test that AudioStreamer initializes correctly."""
-        # Mock event loop
-        mock_loop = Mock()
-        mock_get_event_loop.return_value = mock_loop
+    @pytest.fixture
+    def mock_streams(self):
+        """Create the input and output streams PyAudio opens, in order."""
+        return Mock(), Mock()
 
-        # Mock PyAudio and its streams
+    @pytest.fixture
+    def mock_pyaudio(self, monkeypatch, mock_streams):
+        """Replace PyAudio with a mock that opens the streams above."""
         mock_pyaudio_instance = Mock()
-        mock_pyaudio.return_value = mock_pyaudio_instance
-
-        mock_input_stream = Mock()
-        mock_output_stream = Mock()
-        mock_pyaudio_instance.open.side_effect = [mock_input_stream, mock_output_stream]
-
-        # Mock bedrock stream manager
-        mock_bedrock_manager = Mock()
-
-        # Create AudioStreamer with mock agent
-        mock_agent = Mock()
+        mock_pyaudio_instance.open.side_effect = list(mock_streams)
+        monkeypatch.setattr(
+            audio_streamer_module.pyaudio,
+            "PyAudio",
+            Mock(return_value=mock_pyaudio_instance),
+        )
+        return mock_pyaudio_instance
+
+    @pytest.fixture
+    def mock_bedrock_manager(self):
+        """Create a mock Bedrock stream manager."""
+        return Mock(spec=BedrockStreamManager)
+
+    @pytest.fixture
+    def mock_loop(self):
+        """Create a mock event loop for the streamer to schedule onto."""
+        return Mock()
+
+    @pytest.fixture
+    def audio_streamer(self, mock_pyaudio, mock_bedrock_manager, mock_loop):
+        """Create an AudioStreamer wired to the mocks above."""
+        mock_agent = Mock(spec=SpeechAgent)
         mock_agent.prompt_name = "test_prompt"
         mock_agent.audio_content_name = "test_audio_content"
 
-        audio_streamer = AudioStreamer(mock_bedrock_manager, agent=mock_agent)
+        with patch("asyncio.get_event_loop", return_value=mock_loop):
+            return AudioStreamer(mock_bedrock_manager, agent=mock_agent)
+
+    def test_initialization(
+        self,
+        audio_streamer,
+        mock_pyaudio,
+        mock_streams,
+        mock_bedrock_manager,
+        mock_loop,
+    ):
+        """Test that AudioStreamer initializes correctly."""
+        mock_input_stream, mock_output_stream = mock_streams
 
-        # Verify initialization
         assert audio_streamer.bedrock_stream_manager == mock_bedrock_manager
         assert audio_streamer.is_streaming is False
-        assert audio_streamer.p == mock_pyaudio_instance
+        assert audio_streamer.p == mock_pyaudio
         assert audio_streamer.input_stream == mock_input_stream
         assert audio_streamer.output_stream == mock_output_stream
         assert audio_streamer.loop == mock_loop
 
-    @patch("strands_live.audio_streamer.pyaudio.PyAudio")
     @pytest.mark.asyncio
-    async def test_process_input_audio(self, mock_pyaudio):
+    async def test_process_input_audio(self, audio_streamer, mock_bedrock_manager):
         """Test processing input audio."""
-        # Mock PyAudio
-        mock_pyaudio_instance = Mock()
-        mock_pyaudio.return_value = mock_pyaudio_instance
-        mock_pyaudio_instance.open.return_value = Mock()
-
-        # Mock bedrock stream manager
-        mock_bedrock_manager = Mock()
-        mock_bedrock_manager.add_audio_chunk = Mock()
-
-        # Create AudioStreamer with mock agent
-        mock_agent = Mock()
-        mock_agent.prompt_name = "test_prompt"
-        mock_agent.audio_content_name = "test_audio_content"
-
-        audio_streamer = AudioStreamer(mock_bedrock_manager, agent=mock_agent)
         audio_streamer.is_streaming = True
 
         # Test processing audio data
@@ -72,25 +80,12 @@ class TestAudioStreamer:
             test_audio_data, "test_prompt", "test_audio_content"
         )
 
-    @patch("strands_live.audio_streamer.pyaudio.PyAudio")
     @pytest.mark.asyncio
-    async def test_process_input_audio_error_handling(self, mock_pyaudio):
+    async def test_process_input_audio_error_handling(
+        self, audio_streamer, mock_bedrock_manager
+    ):
         """Test error handling in process_input_audio."""
-        # Mock PyAudio
-        mock_pyaudio_instance = Mock()
-        mock_pyaudio.return_value = mock_pyaudio_instance
-        mock_pyaudio_instance.open.return_value = Mock()
-
-        # Mock bedrock stream manager to raise exception
-        mock_bedrock_manager = Mock()
-        mock_bedrock_manager.add_audio_chunk = Mock(side_effect=Exception("Test error"))
-
-        # Create AudioStreamer with mock agent
-        mock_agent = Mock()
-        mock_agent.prompt_name = "test_prompt"
-        mock_agent.audio_content_name = "test_audio_content"
-
-        audio_streamer = AudioStreamer(mock_bedrock_manager, agent=mock_agent)
+        mock_bedrock_manager.add_audio_chunk.side_effect = Exception("Test error")
         audio_streamer.is_streaming = True
 
         # Test processing audio data with error - should not raise exception
@@ -102,74 +97,18 @@ class TestAudioStreamer:
             test_audio_data, "test_prompt", "test_audio_content"
         )
 
-    @patch("strands_live.audio_streamer.pyaudio.PyAudio")
-    @patch("asyncio.get_event_loop")
-    def test_input_callback(self, mock_get_event_loop, mock_pyaudio):
-        """Test the input callback function."""
-        # Mock event loop
-        mock_loop = Mock()
-        mock_get_event_loop.return_value = mock_loop
-
-        # Mock PyAudio
-        mock_pyaudio_instance = Mock()
-        mock_pyaudio.return_value = mock_pyaudio_instance
-        mock_pyaudio_instance.open.return_value = Mock()
-
-        # Mock bedrock stream manager
-        mock_bedrock_manager = Mock()
-
-        # Create AudioStreamer with mock agent
-        mock_agent = Mock()
-        mock_agent.prompt_name = "test_prompt"
-        mock_agent.audio_content_name = "test_audio_content"
-
-        audio_streamer = AudioStreamer(mock_bedrock_manager, agent=mock_agent)
-        audio_streamer.is_streaming = True
-
-        # Mock asyncio.run_coroutine_threadsafe
-        with patch("asyncio.run_coroutine_threadsafe") as mock_run_coroutine:
-            # Test callback with audio data
-            test_audio_data = b"test audio data"
-            result = audio_streamer.input_callback(test_audio_data, 1024, None, None)
-
-            # Verify the callback scheduled a coroutine
-            mock_run_coroutine.assert_called_once()
-
-            # Verify return value (pyaudio.paContinue is actually 0)
-            assert result == (None, 0)
-
-    @patch("strands_live.audio_streamer.pyaudio.PyAudio")
-    @patch("asyncio.get_event_loop")
-    def test_input_callback_when_not_streaming(self, mock_get_event_loop, mock_pyaudio):
-        """Test the input callback when not streaming."""
-        # Mock event loop
-        mock_loop = Mock()
-        mock_get_event_loop.return_value = mock_loop
-
-        # Mock PyAudio
-        mock_pyaudio_instance = Mock()
-        mock_pyaudio.return_value = mock_pyaudio_instance
-        mock_pyaudio_instance.open.return_value = Mock()
-
-        # Mock bedrock stream manager
-        mock_bedrock_manager = Mock()
-
-        # Create AudioStreamer with mock agent
-        mock_agent = Mock()
-        mock_agent.prompt_name = "test_prompt"
-        mock_agent.audio_content_name = "test_audio_content"
-
-        audio_streamer = AudioStreamer(mock_bedrock_manager, agent=mock_agent)
-        audio_streamer.is_streaming = False  # Not streaming
+    @pytest.mark.parametrize("streaming,expected_calls", [(True, 1), (False, 0)])
+    def test_input_callback(self, audio_streamer, streaming, expected_calls):
+        """Test that the input callback only schedules audio while streaming."""
+        audio_streamer.is_streaming = streaming
 
-        # Mock asyncio.run_coroutine_threadsafe
         with patch("asyncio.run_coroutine_threadsafe") as mock_run_coroutine:
-            # Test callback with audio data
-            test_audio_data = b"test audio data"
-            result = audio_streamer.input_callback(test_audio_data, 1024, None, None)
+            result = audio_streamer.input_callback(b"test audio data", 1024, None, None)
 
-            # Verify no coroutine was scheduled when not streaming
-            mock_run_coroutine.assert_not_called()
+        assert mock_run_coroutine.call_count == expected_calls
+        for call in mock_run_coroutine.call_args_list:
+            # The scheduled coroutine never runs against the mock loop
+            call.args[0].close()
 
-            # Verify return value (pyaudio.paContinue is actually 0)
-            assert result == (None, 0)
+        # Verify return value (pyaudio.paContinue is actually 0)
+        assert result == (None, 0)
@@ -1,45 +1,55 @@
-from unittest.mock import AsyncMock, Mock, patch
+import argparse
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import pytest
+from strands_tools import calculator, current_time
 
-from strands_live.cli import async_main, get_default_tools, run_cli
+from strands_live import cli
+from strands_live.cli import (
+    async_main,
+    get_default_tools,
+    get_event_loop_options,
+    main,
+    run_cli,
+)
+from strands_live.speech_agent import SpeechAgent
+from strands_live.strands_tool_handler import StrandsToolHandler
 
 
 class TestCLI:
     """Test cases for the CLI module."""
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
+    @pytest.fixture
+    def cli_mocks(self, monkeypatch):
+        """Replace the CLI's handler and agent classes with spec'd mocks."""
+        mocks = SimpleNamespace(
+            handler=Mock(spec_set=StrandsToolHandler),
+            agent=Mock(spec_set=SpeechAgent),
+        )
+        mocks.handler_class = Mock(return_value=mocks.handler)
+        mocks.agent_class = Mock(return_value=mocks.agent)
+        monkeypatch.setattr(cli, "StrandsToolHandler", mocks.handler_class)
+        monkeypatch.setattr(cli, "SpeechAgent", mocks.agent_class)
+        return mocks
+
     @pytest.mark.asyncio
-    async def test_main_success(
-        self, mock_speech_agent_class, mock_strands_handler_class
-    ):
+    async def test_main_success(self, cli_mocks):
         """Test the main function runs successfully with Strands handler."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock()
-        mock_speech_agent.start_conversation = AsyncMock()
-        mock_speech_agent_class.return_value = mock_speech_agent
-
         # Run main function
         await async_main(debug=False)
 
         # Verify StrandsToolHandler was created with tools
-        mock_strands_handler_class.assert_called_once()
-        call_args = mock_strands_handler_class.call_args
-        assert "tools" in call_args.kwargs
-        assert (
-            len(call_args.kwargs["tools"]) == 3
-        )  # current_time, calculator, and use_llm
+        cli_mocks.handler_class.assert_called_once()
+        tools_arg = cli_mocks.handler_class.call_args.kwargs["tools"]
+        assert len(tools_arg) == 3  # current_time, calculator, and use_llm
 
         # Verify SpeechAgent was created with Strands handler and default context params
-        mock_speech_agent_class.assert_called_once_with(
+        cli_mocks.agent_class.assert_called_once_with(
             model_id="amazon.nova-sonic-v1:0",
             region="us-east-1",
-            tool_handler=mock_strands_handler,
+            tool_handler=cli_mocks.handler,
             system_prompt=None,
             working_directory=None,
             include_directory_structure=False,
@@ -51,25 +61,13 @@ class TestCLI:
         )
 
         # Verify methods were called
-        mock_speech_agent.initialize.assert_called_once()
-        mock_speech_agent.start_conversation.assert_called_once()
+        cli_mocks.agent.initialize.assert_called_once()
+        cli_mocks.agent.start_conversation.assert_called_once()
+        cli_mocks.handler.close.assert_called_once()
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
     @pytest.mark.asyncio
-    async def test_main_with_custom_tools(
-        self, mock_speech_agent_class, mock_strands_handler_class
-    ):
+    async def test_main_with_custom_tools(self, cli_mocks):
         """Test the main function with custom tools."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock()
-        mock_speech_agent.start_conversation = AsyncMock()
-        mock_speech_agent_class.return_value = mock_speech_agent
-
         # Create custom tools list
         custom_tools = [Mock(), Mock()]
 
@@ -77,80 +75,42 @@ class TestCLI:
         await async_main(debug=False, tools=custom_tools)
 
         # Verify StrandsToolHandler was created with custom tools
-        mock_strands_handler_class.assert_called_once()
-        call_args = mock_strands_handler_class.call_args
-        assert "tools" in call_args.kwargs
-        assert call_args.kwargs["tools"] == custom_tools
+        cli_mocks.handler_class.assert_called_once()
+        assert cli_mocks.handler_class.call_args.kwargs["tools"] == custom_tools
 
         # Verify methods were called
-        mock_speech_agent.initialize.assert_called_once()
-        mock_speech_agent.start_conversation.assert_called_once()
+        cli_mocks.agent.initialize.assert_called_once()
+        cli_mocks.agent.start_conversation.assert_called_once()
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
     @pytest.mark.asyncio
-    async def test_main_with_debug(
-        self, mock_speech_agent_class, mock_strands_handler_class
-    ):
+    async def test_main_with_debug(self, cli_mocks):
         """Test the main function with debug mode enabled."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock()
-        mock_speech_agent.start_conversation = AsyncMock()
-        mock_speech_agent_class.return_value = mock_speech_agent
-
         # Run main function with debug
         await async_main(debug=True)
 
         # Verify StrandsToolHandler was created
-        mock_strands_handler_class.assert_called_once()
-        mock_speech_agent_class.assert_called_once()
-        mock_speech_agent.initialize.assert_called_once()
-        mock_speech_agent.start_conversation.assert_called_once()
+        cli_mocks.handler_class.assert_called_once()
+        cli_mocks.agent_class.assert_called_once()
+        cli_mocks.agent.initialize.assert_called_once()
+        cli_mocks.agent.start_conversation.assert_called_once()
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
     @pytest.mark.asyncio
-    async def test_main_keyboard_interrupt(
-        self, mock_speech_agent_class, mock_strands_handler_class
-    ):
+    async def test_main_keyboard_interrupt(self, cli_mocks):
         """Test that main handles KeyboardInterrupt gracefully."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock()
-        mock_speech_agent.start_conversation = AsyncMock(
-            side_effect=KeyboardInterrupt()
-        )
-        mock_speech_agent_class.return_value = mock_speech_agent
+        cli_mocks.agent.start_conversation.side_effect = KeyboardInterrupt()
 
         # Should not raise exception
         await async_main(debug=False)
 
         # Verify methods were called up to the interruption
-        mock_speech_agent.initialize.assert_called_once()
-        mock_speech_agent.start_conversation.assert_called_once()
+        cli_mocks.agent.initialize.assert_called_once()
+        cli_mocks.agent.start_conversation.assert_called_once()
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
     @patch("builtins.print")
     @pytest.mark.asyncio
-    async def test_main_general_exception(
-        self, mock_print, mock_speech_agent_class, mock_strands_handler_class
-    ):
+    async def test_main_general_exception(self, mock_print, cli_mocks):
         """Test that main handles general exceptions gracefully."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock(side_effect=Exception("Test error"))
-        mock_speech_agent_class.return_value = mock_speech_agent
+        cli_mocks.agent.initialize.side_effect = Exception("Test error")
 
         # Should not raise exception
         await async_main(debug=False)
@@ -158,26 +118,14 @@ class TestCLI:
         # Verify error was printed
         mock_print.assert_called_with("Application error: Test error")
 
-    @patch("strands_live.cli.StrandsToolHandler")
-    @patch("strands_live.cli.SpeechAgent")
     @patch("builtins.print")
     @patch("traceback.print_exc")
     @pytest.mark.asyncio
     async def test_main_exception_with_debug(
-        self,
-        mock_traceback,
-        mock_print,
-        mock_speech_agent_class,
-        mock_strands_handler_class,
+        self, mock_traceback, mock_print, cli_mocks
     ):
         """Test that main prints traceback in debug mode."""
-        # Mock the handler and SpeechAgent
-        mock_strands_handler = Mock()
-        mock_strands_handler_class.return_value = mock_strands_handler
-
-        mock_speech_agent = Mock()
-        mock_speech_agent.initialize = AsyncMock(side_effect=Exception("Test error"))
-        mock_speech_agent_class.return_value = mock_speech_agent
+        cli_mocks.agent.initialize.side_effect = Exception("Test error")
 
         # Should not raise exception
         await async_main(debug=True)
@@ -185,6 +133,19 @@ class TestCLI:
         # Verify error was printed and traceback was shown
         mock_print.assert_called_with("Application error: Test error")
         mock_traceback.assert_called_once()
+        cli_mocks.handler.close.assert_called_once()
+
+    def test_get_event_loop_options_without_uvloop(self):
+        """Test that the default event loop is used when uvloop is missing."""
+        with patch.dict(sys.modules, {"uvloop": None}):
+            assert get_event_loop_options() == {}
+
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason="loop_factory needs Python 3.12")
+    def test_get_event_loop_options_with_uvloop(self):
+        """Test that uvloop's loop factory is selected when uvloop is installed."""
+        fake_uvloop = Mock()
+        with patch.dict(sys.modules, {"uvloop": fake_uvloop}):
+            assert get_event_loop_options() == {"loop_factory": fake_uvloop.new_event_loop}
 
     def test_get_default_tools(self):
         """Test that get_default_tools returns the expected tools."""
@@ -192,92 +153,60 @@ class TestCLI:
         assert isinstance(tools, list)
         assert len(tools) == 3  # current_time, calculator, and use_llm
 
-        # Import the expected tools to compare
-        from strands_tools import calculator, current_time
-
         assert current_time in tools
         assert calculator in tools
 
-    @patch("argparse.ArgumentParser.parse_args")
-    @patch("asyncio.run")
-    def test_run_cli_without_debug(self, mock_asyncio_run, mock_parse_args):
-        """Test run_cli without debug flag."""
-        # Mock argument parsing to return default flags
-        mock_args = Mock()
-        mock_args.debug = False
-        mock_args.model_id = "amazon.nova-sonic-v1:0"
-        mock_args.region = "us-east-1"
-        mock_args.working_dir = None
-        mock_args.include_directory = False
-        mock_args.include_files = False
-        mock_args.include_git = False
-        mock_args.file_patterns = None  # This should be None, not a Mock
-        mock_args.max_depth = 2
-        mock_args.max_files = 20
-        mock_args.custom_prompt = None
-        mock_args.show_context = False
-        mock_parse_args.return_value = mock_args
-
-        # Run CLI
-        run_cli()
-
-        # Verify asyncio.run was called
-        mock_asyncio_run.assert_called_once()
+    @pytest.fixture
+    def cli_args(self):
+        """Parsed command line arguments with every option at its default."""
+        return SimpleNamespace(
+            debug=False,
+            model_id="amazon.nova-sonic-v1:0",
+            region="us-east-1",
+            working_dir=None,
+            include_directory=False,
+            include_files=False,
+            include_git=False,
+            file_patterns=None,
+            max_depth=2,
+            max_files=20,
+            custom_prompt=None,
+            show_context=False,
+        )
 
-    @patch("argparse.ArgumentParser.parse_args")
+    @pytest.mark.parametrize(
+        "debug,error",
+        [(False, None), (True, None), (False, Exception("CLI error"))],
+        ids=["without_debug", "with_debug", "exception_handling"],
+    )
+    @patch("builtins.print")
     @patch("asyncio.run")
-    def test_run_cli_with_debug(self, mock_asyncio_run, mock_parse_args):
-        """Test run_cli with debug flag."""
-        # Mock argument parsing to return debug flag
-        mock_args = Mock()
-        mock_args.debug = True
-        mock_args.model_id = "amazon.nova-sonic-v1:0"
-        mock_args.region = "us-east-1"
-        mock_args.working_dir = None
-        mock_args.include_directory = False
-        mock_args.include_files = False
-        mock_args.include_git = False
-        mock_args.file_patterns = None  # This should be None, not a Mock
-        mock_args.max_depth = 2
-        mock_args.max_files = 20
-        mock_args.custom_prompt = None
-        mock_args.show_context = False
-        mock_parse_args.return_value = mock_args
-
-        # Run CLI
+    def test_run_cli(
+        self, mock_asyncio_run, mock_print, cli_args, monkeypatch, debug, error
+    ):
+        """Test that run_cli runs the agent and handles exceptions gracefully."""
+        cli_args.debug = debug
+        monkeypatch.setattr(
+            argparse.ArgumentParser, "parse_args", lambda self, args=None: cli_args
+        )
+        mock_asyncio_run.side_effect = error
+
+        # Should not raise exception
         run_cli()
 
         # Verify asyncio.run was called
         mock_asyncio_run.assert_called_once()
+        if error is not None:
+            mock_print.assert_called_with("❌ Application error: CLI error")
 
-    @patch("argparse.ArgumentParser.parse_args")
+    @patch("strands_live.cli.async_main", new_callable=Mock)
     @patch("asyncio.run")
-    @patch("builtins.print")
-    def test_run_cli_exception_handling(
-        self, mock_print, mock_asyncio_run, mock_parse_args
-    ):
-        """Test that run_cli handles exceptions gracefully."""
-        # Mock argument parsing
-        mock_args = Mock()
-        mock_args.debug = False
-        mock_args.model_id = "amazon.nova-sonic-v1:0"
-        mock_args.region = "us-east-1"
-        mock_args.working_dir = None
-        mock_args.include_directory = False
-        mock_args.include_files = False
-        mock_args.include_git = False
-        mock_args.file_patterns = None  # This should be None, not a Mock
-        mock_args.max_depth = 2
-        mock_args.max_files = 20
-        mock_args.custom_prompt = None
-        mock_args.show_context = False
-        mock_parse_args.return_value = mock_args
-
-        # Mock asyncio.run to raise exception
-        mock_asyncio_run.side_effect = Exception("CLI error")
+    def test_main_parses_given_argv(self, mock_asyncio_run, mock_async_main):
+        """Test that main() parses an explicit argument list."""
+        main(["--debug", "--include-files", "--file-patterns", "README.md, *.py"])
 
-        # Should not raise exception
-        run_cli()
-
-        # Verify error was printed
-        mock_print.assert_called_with("❌ Application error: CLI error")
+        mock_asyncio_run.assert_called_once()
+        kwargs = mock_async_main.call_args.kwargs
+        assert kwargs["debug"] is True
+        assert kwargs["include_files"] is True
+        assert kwargs["file_patterns"] == ["README.md", "*.py"]
@@ -0,0 +1,289 @@
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from strands_live import context_builder as context_builder_module
+from strands_live.context_builder import ContextBuilder, create_enhanced_system_prompt
+
+
+def _git(path, *args):
+    subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a small git repository with one commit and one untracked file."""
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "README.md").write_text("# Test Project\n")
+    _git(tmp_path, "add", "README.md")
+    _git(tmp_path, "commit", "-q", "-m", "Initial commit")
+    (tmp_path / "notes.txt").write_text("untracked\n")
+    return tmp_path
+
+
+class TestContextBuilder:
+    """Test cases for the ContextBuilder class."""
+
+    def test_get_git_context(self, git_repo):
+        """Test that git context includes branch, commits and status."""
+        context = ContextBuilder(git_repo).get_git_context()
+
+        assert "## Git Repository Context" in context
+        assert "**Current Branch:** `main`" in context
+        assert "Initial commit" in context
+        assert "?? notes.txt" in context
+
+    def test_get_git_context_reports_modified_and_staged_files(self, git_repo):
+        """Test that porcelain v2 entries are rendered as short status lines."""
+        (git_repo / "README.md").write_text("# Changed\n")
+        (git_repo / "staged.txt").write_text("staged\n")
+        _git(git_repo, "add", "staged.txt")
+
+        context = ContextBuilder(git_repo).get_git_context()
+
+        assert " M README.md" in context
+        assert "A  staged.txt" in context
+
+    def test_parse_porcelain_v2(self):
+        """Test parsing of branch headers and change entries."""
+        output = "\n".join(
+            [
+                "# branch.oid 0123456789abcdef",
+                "# branch.head feature",
+                "# branch.upstream origin/feature",
+                "# branch.ab +2 -1",
+                "1 .M N... 100644 100644 100644 abc abc src/app.py",
+                "2 R. N... 100644 100644 100644 abc abc R100 new.py\told.py",
+                "? scratch.txt",
+            ]
+        )
+
+        info = ContextBuilder._parse_porcelain_v2(output)
+
+        assert info == {
+            "branch": "feature",
+            "changes": [
+                " M src/app.py",
+                "R  old.py -> new.py",
+                "?? scratch.txt",
+            ],
+        }
+
+    def test_get_git_context_outside_repository(self, tmp_path):
+        """Test that a plain directory yields no git context."""
+        assert ContextBuilder(tmp_path).get_git_context() == ""
+
+    def test_get_git_context_skips_git_without_repository(self, tmp_path):
+        """Test that git is not consulted when no .git exists above the base path."""
+        builder = ContextBuilder(tmp_path)
+        if builder._find_git_dir() is not None:
+            pytest.skip("temporary directory is inside a git repository")
+
+        with patch.object(builder, "_read_git_context") as read:
+            assert builder.get_git_context() == ""
+        read.assert_not_called()
+
+    def test_get_git_context_from_subdirectory(self, git_repo):
+        """Test that a base path inside a repository finds the enclosing .git."""
+        subdir = git_repo / "src"
+        subdir.mkdir()
+
+        builder = ContextBuilder(subdir)
+
+        assert builder._find_git_dir() == str(git_repo / ".git")
+        assert "**Current Branch:** `main`" in builder.get_git_context()
+
+    def test_build_full_context_is_cached_until_invalidated(self, tmp_path):
+        """Test that repeated builds reuse context until invalidate is called."""
+        (tmp_path / "README.md").write_text("first version\n")
+        builder = ContextBuilder(tmp_path)
+        options = {"include_directory": False, "include_git": False}
+
+        first = builder.build_full_context(**options)
+        (tmp_path / "README.md").write_text("second version\n")
+
+        assert builder.build_full_context(**options) == first
+
+        builder.invalidate()
+        assert "second version" in builder.build_full_context(**options)
+
+    def test_get_git_context_cache_tracks_head(self, git_repo):
+        """Test that a new commit invalidates the cached git context."""
+        builder = ContextBuilder(git_repo)
+        assert "Second commit" not in builder.get_git_context()
+
+        _git(git_repo, "add", "notes.txt")
+        _git(git_repo, "commit", "-q", "-m", "Second commit")
+
+        assert "Second commit" in builder.get_git_context()
+
+    def test_directory_tree_lists_directories_first(self, tmp_path):
+        """Test that the directory tree puts directories before files."""
+        (tmp_path / "b.txt").write_text("b")
+        (tmp_path / "a_dir").mkdir()
+        (tmp_path / "a_dir" / "inner.txt").write_text("inner")
+        (tmp_path / "C.md").write_text("c")
+
+        tree = ContextBuilder(tmp_path)._get_directory_tree(max_depth=2)
+
+        assert tree.splitlines() == [
+            tmp_path.name,
+            "├── a_dir",
+            "│   └── inner.txt",
+            "├── b.txt",
+            "└── C.md",
+        ]
+
+    def test_directory_tree_truncates_after_max_files(self, tmp_path):
+        """Test that the directory tree stops after max_files entries."""
+        for i in range(5):
+            (tmp_path / f"file{i}.txt").write_text(str(i))
+
+        tree = ContextBuilder(tmp_path)._get_directory_tree(max_files=3)
+
+        assert tree.splitlines()[1:] == [
+            "├── file0.txt",
+            "├── file1.txt",
+            "├── file2.txt",
+            "├── ... (truncated)",
+        ]
+
+    def test_directory_listing_cache_tracks_directory_changes(self, tmp_path):
+        """Test that cached listings are reused until the directory changes."""
+        (tmp_path / "a.txt").write_text("a")
+        builder = ContextBuilder(tmp_path)
+
+        first = builder._list_directory(str(tmp_path))
+        assert builder._list_directory(str(tmp_path)) is first
+
+        (tmp_path / "b.txt").write_text("b")
+        os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+
+        assert [item[2] for item in builder._list_directory(str(tmp_path))] == [
+            "a.txt",
+            "b.txt",
+        ]
+
+    def test_missing_files_are_skipped_until_directory_changes(self, tmp_path):
+        """Test that known-missing files are not probed again until created."""
+        builder = ContextBuilder(tmp_path)
+
+        assert builder.get_file_context(["README.md"]) == ""
+        with patch.object(builder, "_read_if_exists") as read:
+            assert builder.get_file_context(["README.md"]) == ""
+        read.assert_not_called()
+
+        (tmp_path / "README.md").write_text("now present")
+        os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+
+        assert "now present" in builder.get_file_context(["README.md"])
+
+    def test_read_file_safely_truncates_long_files(self, tmp_path):
+        """Test that only the first max_lines lines are returned."""
+        path = tmp_path / "long.txt"
+        path.write_text("".join(f"line {i}   \n" for i in range(10)))
+
+        content = ContextBuilder(tmp_path)._read_file_safely(path, max_lines=3)
+
+        assert content == "line 0\nline 1\nline 2\n... (truncated)"
+
+    def test_read_file_safely_drops_partial_line_at_byte_cap(self, tmp_path):
+        """Test that a line cut by the byte cap is not returned."""
+        path = tmp_path / "wide.txt"
+        path.write_text("short\n" + "x" * 100 + "\n")
+
+        content = ContextBuilder(tmp_path)._read_file_safely(path, max_bytes=20)
+
+        assert content == "short\n... (truncated)"
+
+    def test_read_file_safely_replaces_invalid_utf8(self, tmp_path):
+        """Test that undecodable bytes do not prevent reading a file."""
+        path = tmp_path / "binary.txt"
+        path.write_bytes(b"ok \xff\n")
+
+        assert ContextBuilder(tmp_path)._read_file_safely(path) == "ok \ufffd"
+
+    def test_get_file_context_keeps_pattern_order(self, tmp_path):
+        """Test that file sections follow the requested patterns and skip missing files."""
+        (tmp_path / "first.md").write_text("first")
+        (tmp_path / "second.md").write_text("second")
+        (tmp_path / "folder.md").mkdir()
+
+        context = ContextBuilder(tmp_path).get_file_context(
+            ["second.md", "missing.md", "folder.md", "first.md"]
+        )
+
+        assert "## missing.md" not in context
+        assert "## folder.md" not in context
+        assert context.index("## second.md") < context.index("## first.md")
+
+    def test_file_and_git_reads_use_the_shared_pool(self, git_repo):
+        """Test that file reads and git queries run on the shared context pool."""
+        builder = ContextBuilder(git_repo)
+
+        with (
+            patch("strands_live.context_builder.pygit2", None),
+            patch(
+                "strands_live.context_builder._get_context_pool",
+                wraps=context_builder_module._get_context_pool,
+            ) as get_pool,
+        ):
+            builder.get_file_context(["README.md"])
+            builder._read_git_context()
+
+        assert get_pool.call_count == 2
+
+    def test_pygit2_context_matches_git_cli(self, git_repo):
+        """Test that the pygit2 backend renders the same context as the git CLI."""
+        pytest.importorskip("pygit2")
+        (git_repo / "README.md").write_text("# Changed\n")
+        (git_repo / "staged.txt").write_text("staged\n")
+        _git(git_repo, "add", "staged.txt")
+        builder = ContextBuilder(git_repo)
+
+        with patch("strands_live.context_builder.pygit2", None):
+            expected = builder._read_git_context()
+
+        assert builder._read_git_context_pygit2() == expected
+
+    def test_pygit2_context_matches_git_cli_for_unstaged_file(self, git_repo):
+        """Test that a file removed from the index but kept on disk shows twice."""
+        pytest.importorskip("pygit2")
+        _git(git_repo, "rm", "-q", "--cached", "README.md")
+        builder = ContextBuilder(git_repo)
+
+        with patch("strands_live.context_builder.pygit2", None):
+            expected = builder._read_git_context()
+
+        assert "D  README.md" in expected
+        assert "?? README.md" in expected
+        assert builder._read_git_context_pygit2() == expected
+
+    def test_pygit2_context_falls_back_to_git_cli_for_renames(self, git_repo):
+        """Test that a staged rename is reported by the git CLI, not pygit2."""
+        pytest.importorskip("pygit2")
+        _git(git_repo, "mv", "README.md", "README2.md")
+        builder = ContextBuilder(git_repo)
+
+        with patch("strands_live.context_builder.pygit2", None):
+            expected = builder._read_git_context()
+
+        assert "R  README.md -> README2.md" in expected
+        assert builder._read_git_context_pygit2() is None
+        assert builder._read_git_context() == expected
+
+    def test_create_enhanced_system_prompt_without_context(self, tmp_path):
+        """Test that the base prompt is returned when no context is gathered."""
+        prompt = create_enhanced_system_prompt(
+            base_prompt="Base prompt",
+            context_builder=ContextBuilder(tmp_path),
+            include_directory=False,
+            include_files=False,
+            include_git=False,
+        )
+
+        assert prompt == "Base prompt"
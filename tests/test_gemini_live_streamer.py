@@ -0,0 +1,114 @@
+import asyncio
+import base64
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from strands_live.gemini_live_streamer import GeminiLiveStreamManager
+
+
+class TestGeminiLiveStreamManager:
+    """Test cases for the GeminiLiveStreamManager class."""
+
+    @pytest.fixture
+    def stream_manager(self):
+        """Create a stream manager without a tool handler."""
+        return GeminiLiveStreamManager(api_key="test-key", model_id="test-model")
+
+    @pytest.fixture
+    async def sent_messages(self, stream_manager):
+        """Run the audio sender against a mock websocket, collecting its messages."""
+        messages = asyncio.Queue()
+        stream_manager.websocket = AsyncMock()
+        stream_manager.websocket.send.side_effect = messages.put_nowait
+        stream_manager.is_active = True
+        task = asyncio.create_task(stream_manager._process_audio_input())
+
+        yield messages
+
+        stream_manager.is_active = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @staticmethod
+    def _audio_payload(message):
+        """Decode the audio bytes carried by a realtime_input message."""
+        chunk = json.loads(message)["realtime_input"]["media_chunks"][0]
+        return base64.b64decode(chunk["data"])
+
+    def test_add_audio_chunk_drops_oldest_when_full(self, stream_manager):
+        """Test that a full audio buffer drops and counts the oldest chunks."""
+        buffer_size = stream_manager.AUDIO_INPUT_BUFFER_SIZE
+        for i in range(buffer_size + 2):
+            stream_manager.add_audio_chunk(bytes([i]))
+
+        assert len(stream_manager.audio_input_buffer) == buffer_size
+        assert stream_manager.dropped_audio_chunks == 2
+        assert stream_manager.audio_input_buffer[0] == bytes([2])
+
+    def test_add_audio_chunk_ignores_empty_audio(self, stream_manager):
+        """Test that empty chunks are neither buffered nor wake the sender."""
+        stream_manager.add_audio_chunk(b"")
+
+        assert not stream_manager.audio_input_buffer
+        assert not stream_manager.audio_input_ready.is_set()
+
+    async def test_audio_sender_wakes_for_new_audio(
+        self, stream_manager, sent_messages
+    ):
+        """Test that an idle sender sends a chunk as soon as it is added."""
+        await asyncio.sleep(0)
+        assert sent_messages.empty()
+
+        stream_manager.add_audio_chunk(b"hello")
+
+        message = await asyncio.wait_for(sent_messages.get(), timeout=1)
+        assert self._audio_payload(message) == b"hello"
+
+    async def test_audio_sender_batches_backlog(self, stream_manager, sent_messages):
+        """Test that queued chunks are merged into messages of at most the batch size."""
+        batch_size = stream_manager.AUDIO_BATCH_MAX_CHUNKS
+        chunks = [bytes([i]) for i in range(batch_size + 2)]
+        for chunk in chunks:
+            stream_manager.add_audio_chunk(chunk)
+
+        first = await asyncio.wait_for(sent_messages.get(), timeout=1)
+        second = await asyncio.wait_for(sent_messages.get(), timeout=1)
+
+        assert self._audio_payload(first) == b"".join(chunks[:batch_size])
+        assert self._audio_payload(second) == b"".join(chunks[batch_size:])
+
+    def test_setup_message_reuses_prefix(self, stream_manager):
+        """Test that the setup message is valid JSON and its prefix is cached."""
+        first = stream_manager._setup_message_json()
+        second = GeminiLiveStreamManager(model_id="test-model")._setup_message_json()
+
+        assert first == second
+        setup = json.loads(first)["setup"]
+        assert setup["model"] == "models/test-model"
+        assert setup["tools"] == []
+
+    def test_setup_message_follows_instruction_and_tools(self, stream_manager):
+        """Test that the cached prefix never leaks between differing sessions."""
+        tool = {"function_declarations": [{"name": "lookup"}]}
+        tool_handler = Mock()
+        tool_handler.get_gemini_tool_config.return_value = [tool]
+        with_tools = GeminiLiveStreamManager(
+            model_id="test-model", tool_handler=tool_handler
+        )
+        instructed = GeminiLiveStreamManager(model_id="test-model")
+        instructed.SYSTEM_INSTRUCTION = "Answer in French."
+
+        base = json.loads(stream_manager._setup_message_json())["setup"]
+        tools = json.loads(with_tools._setup_message_json())["setup"]
+        instruction = json.loads(instructed._setup_message_json())["setup"]
+
+        assert tools["tools"] == [tool]
+        assert tools["system_instruction"] == base["system_instruction"]
+        assert instruction["tools"] == []
+        assert instruction["system_instruction"] == {
+            "parts": [{"text": "Answer in French."}]
+        }
+        base_text = base["system_instruction"]["parts"][0]["text"]
+        assert base_text == GeminiLiveStreamManager.SYSTEM_INSTRUCTION
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+import pytest
+
+from strands_live import serialization
+
+
+class TestSerialization:
+    """Test cases for the JSON helpers."""
+
+    def test_round_trip(self):
+        """Test that dumps output parses back to the same object."""
+        event = {
+            "event": {"textInput": {"content": 'Say "hi"\nnow', "n": [1, 2.5, None]}}
+        }
+
+        assert serialization.loads(serialization.dumps(event)) == event
+
+    def test_stdlib_fallback(self):
+        """Test that the standard library is used when orjson is unavailable."""
+        with patch.object(serialization, "orjson", None):
+            assert serialization.dumps({"a": 1}) == '{"a": 1}'
+            assert serialization.loads(b'{"a": 1}') == {"a": 1}
+
+    def test_dumps_falls_back_for_unsupported_types(self):
+        """Test that objects orjson rejects are still serialized like json.dumps."""
+        pytest.importorskip("orjson")
+
+        assert serialization.dumps({1: "one"}) == '{"1": "one"}'
+
+    def test_loads_invalid_json_raises_json_decode_error(self):
+        """Test that decode errors are catchable as JSONDecodeError with either backend."""
+        with pytest.raises(serialization.JSONDecodeError):
+            serialization.loads("{not json")
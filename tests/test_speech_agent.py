@@ -1,8 +1,13 @@
+import base64
+import json
+import sys
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from strands_tools import calculator, current_time
 
 from strands_live.speech_agent import SpeechAgent
+from strands_live.strands_tool_handler import StrandsToolHandler
 
 
 class TestSpeechAgent:
@@ -30,19 +35,221 @@ class TestSpeechAgent:
             assert agent.bedrock_stream_manager is not None
             assert agent.audio_streamer is not None
 
+    @pytest.mark.asyncio
+    async def test_initialize_conversation_sends_setup_events(self):
+        """Test that the prebuilt setup events carry the expected payloads."""
+        self.speech_agent.system_prompt = 'Say "hi"\nthen wait'
+        send_batch = AsyncMock()
+        self.speech_agent.bedrock_stream_manager.send_raw_events_batch = send_batch
+
+        await self.speech_agent._initialize_conversation()
+
+        send_batch.assert_called_once()
+        sent = [json.loads(event) for event in send_batch.call_args.args[0]]
+        assert [next(iter(event["event"])) for event in sent] == [
+            "sessionStart",
+            "promptStart",
+            "contentStart",
+            "textInput",
+            "contentEnd",
+        ]
+        assert (
+            sent[1]["event"]["promptStart"]["promptName"]
+            == self.speech_agent.prompt_name
+        )
+        assert sent[3]["event"]["textInput"] == {
+            "promptName": self.speech_agent.prompt_name,
+            "contentName": self.speech_agent.content_name,
+            "content": 'Say "hi"\nthen wait',
+        }
+
+    @pytest.mark.asyncio
+    async def test_prompt_start_includes_tools_added_after_construction(self):
+        """Test that promptStart carries tools registered before initialization."""
+        with (
+            patch("strands_live.speech_agent.AudioStreamer"),
+            patch("strands_live.speech_agent.BedrockStreamManager"),
+        ):
+            agent = SpeechAgent(tool_handler=StrandsToolHandler(tools=[current_time]))
+        agent.tool_handler.add_strands_tools([calculator])
+        send_batch = AsyncMock()
+        agent.bedrock_stream_manager.send_raw_events_batch = send_batch
+
+        await agent._initialize_conversation()
+
+        prompt_start = json.loads(send_batch.call_args.args[0][1])["event"][
+            "promptStart"
+        ]
+        tool_names = [
+            tool["toolSpec"]["name"]
+            for tool in prompt_start["toolConfiguration"]["tools"]
+        ]
+        assert tool_names == ["current_time", "calculator"]
+        assert prompt_start["promptName"] == agent.prompt_name
+
+    @pytest.mark.asyncio
+    async def test_handle_text_output_detects_barge_in(self):
+        """Test that the interrupted marker sets barge_in regardless of spacing."""
+        for marker in ('{ "interrupted" : true }', '{"interrupted":true}'):
+            self.speech_agent.barge_in = False
+            await self.speech_agent._handle_text_output({"content": marker})
+            assert self.speech_agent.barge_in is True
+
+        self.speech_agent.barge_in = False
+        await self.speech_agent._handle_text_output(
+            {"content": 'I was "interrupted" earlier, true story.'}
+        )
+        assert self.speech_agent.barge_in is False
+
+    @pytest.mark.asyncio
+    async def test_handle_audio_output_queues_decoded_audio(self):
+        """Test that base64 audio content is decoded onto the output queue."""
+        self.speech_agent.bedrock_stream_manager.audio_output_queue.put = AsyncMock()
+
+        await self.speech_agent._handle_audio_output(
+            {"content": base64.b64encode(b"\x00\x01pcm").decode()}
+        )
+
+        self.speech_agent.bedrock_stream_manager.audio_output_queue.put.assert_awaited_once_with(
+            b"\x00\x01pcm"
+        )
+
+    @pytest.mark.asyncio
+    async def test_handle_text_output_writes_transcript(self, capsys):
+        """Test that user and displayed assistant text reach stdout."""
+        self.speech_agent.current_role = "USER"
+        await self.speech_agent._handle_text_output({"content": "hello"})
+        self.speech_agent.current_role = "ASSISTANT"
+        self.speech_agent.display_assistant_text = True
+        await self.speech_agent._handle_text_output({"content": "hi there"})
+
+        assert capsys.readouterr().out == (
+            "\n----- USER -------\nUser: hello\n\n\nAssistant: hi there\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_handle_response_event_dispatches_by_event_type(self):
+        """Test that response events reach the handler for their type."""
+        self.speech_agent._handle_audio_output = AsyncMock()
+
+        await self.speech_agent.handle_response_event(
+            {"event": {"audioOutput": {"content": "AAAA"}}}
+        )
+        await self.speech_agent.handle_response_event({"event": {"usageEvent": {}}})
+        await self.speech_agent.handle_response_event({"other": {}})
+
+        self.speech_agent._handle_audio_output.assert_awaited_once_with(
+            {"content": "AAAA"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_session_events_follow_config_changes(self):
+        """Test that setup events reflect settings changed after construction."""
+        assert self.speech_agent.get_audio_output_config()["voiceId"] == "matthew"
+        send_batch = AsyncMock()
+        self.speech_agent.bedrock_stream_manager.initialize_stream = AsyncMock()
+        self.speech_agent.bedrock_stream_manager.send_raw_events_batch = send_batch
+        await self.speech_agent.initialize()
+
+        self.speech_agent.voice_id = "tiffany"
+        self.speech_agent.max_tokens = 512
+        await self.speech_agent.initialize()
+
+        assert self.speech_agent.get_audio_output_config()["voiceId"] == "tiffany"
+        assert self.speech_agent.get_inference_config()["maxTokens"] == 512
+        session_start, prompt_start = (
+            json.loads(event) for event in send_batch.call_args.args[0][:2]
+        )
+        assert (
+            session_start["event"]["sessionStart"]["inferenceConfiguration"][
+                "maxTokens"
+            ]
+            == 512
+        )
+        assert (
+            prompt_start["event"]["promptStart"]["audioOutputConfiguration"]["voiceId"]
+            == "tiffany"
+        )
+
+    def test_session_configs_are_not_shared(self):
+        """Test that mutating a returned config doesn't leak into the session."""
+        self.speech_agent.get_inference_config()["maxTokens"] = 1
+        self.speech_agent.get_audio_output_config()["voiceId"] = "other"
+
+        assert self.speech_agent.get_inference_config()["maxTokens"] == 1024
+        assert self.speech_agent.get_audio_output_config()["voiceId"] == "matthew"
+
+    @pytest.mark.asyncio
+    async def test_handle_content_start_tracks_speculative_content(self):
+        """Test that only SPECULATIVE generation stages display assistant text."""
+        with patch("strands_live.speech_agent.loads", wraps=json.loads) as parse:
+            await self.speech_agent._handle_content_start(
+                {
+                    "role": "ASSISTANT",
+                    "additionalModelFields": '{"generationStage":"SPECULATIVE"}',
+                }
+            )
+            assert self.speech_agent.display_assistant_text is True
+
+            await self.speech_agent._handle_content_start(
+                {
+                    "role": "ASSISTANT",
+                    "additionalModelFields": '{"generationStage":"FINAL"}',
+                }
+            )
+            assert self.speech_agent.display_assistant_text is False
+
+        parse.assert_called_once()
+
+    def test_context_builder_not_imported_without_context(self, monkeypatch):
+        """Test that an agent with all context flags off never loads context_builder."""
+        monkeypatch.delitem(sys.modules, "strands_live.context_builder", raising=False)
+
+        with (
+            patch("strands_live.speech_agent.AudioStreamer"),
+            patch("strands_live.speech_agent.BedrockStreamManager"),
+        ):
+            SpeechAgent()
+
+        assert "strands_live.context_builder" not in sys.modules
+
+    def test_project_context_is_built_once_until_refresh(self, tmp_path):
+        """Test that prompt and raw context share one memoized context build."""
+        (tmp_path / "README.md").write_text("# Demo\n")
+        with (
+            patch("strands_live.speech_agent.AudioStreamer"),
+            patch("strands_live.speech_agent.BedrockStreamManager"),
+            patch(
+                "strands_live.context_builder.ContextBuilder.build_full_context",
+                autospec=True,
+                return_value="## Project Context",
+            ) as build,
+        ):
+            agent = SpeechAgent(working_directory=tmp_path, include_project_files=True)
+            builder = agent._context_builder
+
+            assert agent.system_prompt.endswith("\n\n## Project Context")
+            assert agent.get_raw_context() == "## Project Context"
+            assert build.call_count == 1
+
+            agent.refresh_context()
+
+            assert build.call_count == 2
+            assert agent._context_builder is not builder
+
     @pytest.mark.asyncio
     async def test_initialize(self):
         """Test the initialize method."""
         # Mock the bedrock stream manager's methods
         self.speech_agent.bedrock_stream_manager.initialize_stream = AsyncMock()
-        self.speech_agent.bedrock_stream_manager.send_raw_event = AsyncMock()
+        self.speech_agent.bedrock_stream_manager.send_raw_events_batch = AsyncMock()
 
         await self.speech_agent.initialize()
 
         # Verify initialize_stream was called
         self.speech_agent.bedrock_stream_manager.initialize_stream.assert_called_once()
-        # Verify send_raw_event was called for conversation initialization
-        self.speech_agent.bedrock_stream_manager.send_raw_event.assert_called()
+        # Verify the setup events were sent for conversation initialization
+        self.speech_agent.bedrock_stream_manager.send_raw_events_batch.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_process_tool_use_delegation(self):
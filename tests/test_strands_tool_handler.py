@@ -7,6 +7,7 @@ which integrates the Strands Agents SDK with our speech-based agent system.
 
 import asyncio
 import json
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -375,6 +376,73 @@ class TestStrandsToolHandler:
         result = await handler.validate_tool_request(tool_name, params)
         assert result == expected
 
+    def test_get_bedrock_tool_config_is_cached_until_tools_added(self):
+        """Test that the Bedrock config is reused until a tool is added."""
+        handler = StrandsToolHandler(tools=[current_time])
+
+        config = handler.get_bedrock_tool_config()
+        assert handler.get_bedrock_tool_config() is config
+
+        handler.add_strands_tools([calculator])
+        tool_names = [
+            tool["toolSpec"]["name"]
+            for tool in handler.get_bedrock_tool_config()["tools"]
+        ]
+        assert tool_names == ["current_time", "calculator"]
+
+    def test_get_bedrock_tool_config_scans_registry_once(self, handler):
+        """Test that building the Bedrock config reads the registry configs once."""
+        original = handler.registry.get_all_tools_config
+        handler.registry.get_all_tools_config = MagicMock(side_effect=original)
+
+        handler.get_bedrock_tool_config()
+
+        handler.registry.get_all_tools_config.assert_called_once()
+
+    def test_get_tool_schema_is_cached_until_tools_added(self):
+        """Test that known tool schemas are reused and misses are not cached."""
+        handler = StrandsToolHandler(tools=[current_time])
+        original = handler.registry.get_all_tools_config
+        handler.registry.get_all_tools_config = MagicMock(side_effect=original)
+
+        schema = handler.get_tool_schema("current_time")
+        assert handler.get_tool_schema("current_time") is schema
+        assert handler.get_tool_schema("calculator") is None
+        assert handler.get_tool_schema("calculator") is None
+        assert handler.registry.get_all_tools_config.call_count == 3
+        assert list(handler._tool_schema_cache) == ["current_time"]
+
+        handler.add_strands_tools([calculator])
+        assert handler.get_tool_schema("calculator") is not None
+
+    async def test_tools_run_on_dedicated_executor(self):
+        """Test that tool invocations use the handler's bounded thread pool."""
+        handler = StrandsToolHandler(config={"tool_workers": 2})
+        assert handler._tool_executor._max_workers == 2
+
+        thread_names = []
+
+        def invoke(tool_use):
+            thread_names.append(threading.current_thread().name)
+            return {"status": "success", "content": [{"text": "ok"}]}
+
+        mock_tool = MagicMock()
+        mock_tool.invoke.side_effect = invoke
+        handler.registry.registry = {"mock_tool": mock_tool}
+
+        result = await handler.process_tool_use("mock_tool", {"content": "{}"})
+
+        assert result == {"status": "success", "content": [{"text": "ok"}]}
+        assert thread_names[0].startswith("strands-tool")
+        handler.close()
+
+    def test_close_is_idempotent(self, handler):
+        """Test that closing twice shuts the tool pool down once without error."""
+        handler.close()
+        handler.close()
+
+        assert handler._tool_executor._shutdown is True
+
     def test_bedrock_integration_format(self, handler):
         """Test that the Bedrock integration format is correct."""
         config = handler.get_bedrock_tool_config()
@@ -1,7 +1,10 @@
+import datetime
 import json
+import random
 from unittest.mock import patch
 
 import pytest
+import pytz
 
 from strands_live.tool_handler import ToolHandler
 from strands_live.tool_handler_base import ToolHandlerBase
@@ -115,10 +118,21 @@ class TestToolHandler:
         # Test unsupported tool
         assert self.tool_handler.is_tool_supported("unknownTool") is False
 
-    @pytest.mark.asyncio
-    async def test_get_date_and_time_default_timezone(self):
+    def test_is_tool_supported_lists_tools_once(self):
+        """Test that support checks reuse the lowercased tool set."""
+        with patch.object(
+            self.tool_handler,
+            "get_supported_tools",
+            wraps=self.tool_handler.get_supported_tools,
+        ) as get_supported_tools:
+            for _ in range(3):
+                assert self.tool_handler.is_tool_supported("TrackOrderTool") is True
+
+        get_supported_tools.assert_called_once()
+
+    def test_get_date_and_time_default_timezone(self):
         """Test the date and time tool with default timezone."""
-        result = await self.tool_handler._get_date_and_time()
+        result = self.tool_handler._get_date_and_time()
 
         assert "formattedTime" in result
         assert "date" in result
@@ -129,67 +143,99 @@ class TestToolHandler:
         assert "timezone" in result
         assert result["timezone"] == "Los_Angeles"  # Extracted from America/Los_Angeles
 
-    @pytest.mark.asyncio
-    async def test_get_date_and_time_custom_timezone(self):
+    def test_get_date_and_time_formats_date_fields(self):
+        """Test that the date and weekday match the reported year, month and day."""
+        result = self.tool_handler._get_date_and_time()
+        date = datetime.date(result["year"], result["month"], result["day"])
+
+        assert result["date"] == date.strftime("%Y-%m-%d")
+        assert result["dayOfWeek"] == date.strftime("%A").upper()
+
+    def test_get_date_and_time_reuses_result_within_minute(self):
+        """Test that the date and time result is recomputed only per minute."""
+        minute = 1_699_999_980.0  # A minute boundary
+        with patch("strands_live.tool_handler.time.time", return_value=minute + 5):
+            first = self.tool_handler._get_date_and_time()
+        with patch("strands_live.tool_handler.time.time", return_value=minute + 59):
+            assert self.tool_handler._get_date_and_time() == first
+            assert self.tool_handler._date_time_cache[1] == minute + 5
+        with patch("strands_live.tool_handler.time.time", return_value=minute + 60):
+            later = self.tool_handler._get_date_and_time()
+
+        assert self.tool_handler._date_time_cache[1] == minute + 60
+        assert later["formattedTime"] != first["formattedTime"]
+
+    def test_get_date_and_time_caches_timezone_lookup(self):
+        """Test that pytz is only consulted when the timezone name changes."""
+        with patch(
+            "strands_live.tool_handler.pytz.timezone", wraps=pytz.timezone
+        ) as lookup:
+            self.tool_handler._get_date_and_time()
+            self.tool_handler._get_date_and_time()
+            assert lookup.call_count == 1
+
+            self.tool_handler.set_config("timezone", "Asia/Tokyo")
+            result = self.tool_handler._get_date_and_time()
+
+        assert lookup.call_count == 2
+        assert result["timezone"] == "Tokyo"
+
+    def test_get_date_and_time_custom_timezone(self):
         """Test the date and time tool with custom timezone."""
         custom_config = {"timezone": "Europe/London"}
         handler = ToolHandler(custom_config)
 
-        result = await handler._get_date_and_time()
+        result = handler._get_date_and_time()
 
         assert result["timezone"] == "London"
 
-    @pytest.mark.asyncio
-    async def test_track_order_valid_id(self):
+    def test_track_order_valid_id(self):
         """Test order tracking with a valid order ID."""
         tool_use_content = {
             "content": json.dumps({"orderId": "12345"}),
             "requestNotifications": False,
         }
 
-        result = await self.tool_handler._track_order(tool_use_content)
+        result = self.tool_handler._track_order(tool_use_content)
 
         assert "orderStatus" in result
         assert "orderNumber" in result
         assert result["orderNumber"] == "12345"
         assert "error" not in result
 
-    @pytest.mark.asyncio
-    async def test_track_order_with_dict_content(self):
+    def test_track_order_with_dict_content(self):
         """Test order tracking with dictionary content instead of JSON string."""
         tool_use_content = {
             "content": {"orderId": "67890"},
             "requestNotifications": False,
         }
 
-        result = await self.tool_handler._track_order(tool_use_content)
+        result = self.tool_handler._track_order(tool_use_content)
 
         assert "orderStatus" in result
         assert "orderNumber" in result
         assert result["orderNumber"] == "67890"
 
-    @pytest.mark.asyncio
-    async def test_track_order_invalid_id(self):
+    def test_track_order_invalid_id(self):
         """Test order tracking with an invalid order ID."""
         tool_use_content = {
             "content": json.dumps({"orderId": ""}),
             "requestNotifications": False,
         }
 
-        result = await self.tool_handler._track_order(tool_use_content)
+        result = self.tool_handler._track_order(tool_use_content)
 
         assert "error" in result
         assert result["error"] == "Invalid order ID format"
 
-    @pytest.mark.asyncio
-    async def test_track_order_with_notifications(self):
+    def test_track_order_with_notifications(self):
         """Test order tracking with notifications enabled."""
         tool_use_content = {
             "content": json.dumps({"orderId": "NOTIFY123"}),
             "requestNotifications": True,
         }
 
-        result = await self.tool_handler._track_order(tool_use_content)
+        result = self.tool_handler._track_order(tool_use_content)
 
         assert "orderNumber" in result
         assert result["orderNumber"] == "NOTIFY123"
@@ -198,23 +244,29 @@ class TestToolHandler:
             assert "notificationStatus" in result
             assert "NOTIFY123" in result["notificationStatus"]
 
-    @pytest.mark.asyncio
-    async def test_track_order_deterministic(self):
+    def test_track_order_deterministic(self):
         """Test that the same order ID always returns the same status."""
         tool_use_content = {
             "content": json.dumps({"orderId": "TEST123"}),
             "requestNotifications": False,
         }
 
-        result1 = await self.tool_handler._track_order(tool_use_content)
-        result2 = await self.tool_handler._track_order(tool_use_content)
+        result1 = self.tool_handler._track_order(tool_use_content)
+        result2 = self.tool_handler._track_order(tool_use_content)
 
         # Same order ID should return same status
         assert result1["orderStatus"] == result2["orderStatus"]
         assert result1["orderNumber"] == result2["orderNumber"]
 
-    @pytest.mark.asyncio
-    async def test_track_order_custom_statuses(self):
+    def test_track_order_leaves_global_random_state(self):
+        """Test that order tracking does not reseed the module-level RNG."""
+        state = random.getstate()
+
+        self.tool_handler._track_order({"orderId": "TEST123"})
+
+        assert random.getstate() == state
+
+    def test_track_order_custom_statuses(self):
         """Test order tracking with custom status configuration."""
         custom_config = {
             "order_statuses": ["Custom Status 1", "Custom Status 2"],
@@ -227,10 +279,47 @@ class TestToolHandler:
             "requestNotifications": False,
         }
 
-        result = await handler._track_order(tool_use_content)
+        result = handler._track_order(tool_use_content)
 
         assert result["orderStatus"] in ["Custom Status 1", "Custom Status 2"]
 
+    def test_track_order_rejects_mismatched_weights(self):
+        """Test that status weights must line up with the configured statuses."""
+        handler = ToolHandler(
+            {"order_statuses": ["A", "B", "C"], "status_weights": [50, 50]}
+        )
+
+        with pytest.raises(ValueError, match="number of weights"):
+            handler._track_order({"orderId": "TEST123"})
+
+    @pytest.mark.parametrize(
+        "weights,message",
+        [
+            ([0, 0], "greater than zero"),
+            ([-1, 1], "greater than zero"),
+            ([1, float("inf")], "finite"),
+            ([1, float("nan")], "finite"),
+        ],
+    )
+    def test_track_order_rejects_invalid_weight_totals(self, weights, message):
+        """Test that weights must sum to a positive, finite total."""
+        handler = ToolHandler({"order_statuses": ["A", "B"], "status_weights": weights})
+
+        with pytest.raises(ValueError, match=message):
+            handler._track_order({"orderId": "TEST123"})
+
+    def test_track_order_follows_weights_changed_in_place(self):
+        """Test that in-place edits to the weights list are not served stale."""
+        handler = ToolHandler(
+            {"order_statuses": ["A", "B"], "status_weights": [100, 0]}
+        )
+        assert handler._track_order({"orderId": "TEST123"})["orderStatus"] == "A"
+
+        weights = handler.get_config("status_weights")
+        weights[:] = [0, 100]
+
+        assert handler._track_order({"orderId": "TEST123"})["orderStatus"] == "B"
+
     @pytest.mark.asyncio
     async def test_process_tool_use_date_time(self):
         """Test processing the date and time tool."""
@@ -256,6 +345,20 @@ class TestToolHandler:
         assert "orderNumber" in result
         assert "error" not in result
 
+    @pytest.mark.asyncio
+    async def test_process_tool_use_parses_content_once(self):
+        """Test that string content is decoded once for validation and tracking."""
+        tool_use_content = {"content": json.dumps({"orderId": "PARSE123"})}
+
+        with patch("strands_live.tool_handler.loads", wraps=json.loads) as parse:
+            result = await self.tool_handler.process_tool_use(
+                "trackOrderTool", tool_use_content
+            )
+
+        parse.assert_called_once()
+        assert result["orderNumber"] == "PARSE123"
+        assert isinstance(tool_use_content["content"], str)
+
     @pytest.mark.asyncio
     async def test_process_tool_use_unknown_tool(self):
         """Test processing an unknown tool."""
@@ -349,6 +452,18 @@ class TestToolHandler:
         assert "Tool execution failed" in result["error"]
         assert "Invalid tool request" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_process_tool_use_honours_overridden_validation(self):
+        """Test that a subclass validate_tool_request still gates execution."""
+
+        class StrictToolHandler(ToolHandler):
+            async def validate_tool_request(self, tool_name, tool_use_content):
+                return False
+
+        result = await StrictToolHandler().process_tool_use("getDateAndTimeTool", {})
+
+        assert "Invalid tool request" in result["error"]
+
     def test_get_handler_info(self):
         """Test getting handler information."""
         info = self.tool_handler.get_handler_info()
@@ -427,20 +542,30 @@ class TestToolHandler:
         assert "orderId" in schema["required"]
         assert schema["properties"]["orderId"]["type"] == "string"
 
-    @pytest.mark.asyncio
-    async def test_track_order_new_format(self):
+    def test_bedrock_tool_config_converts_schemas_once(self):
+        """Test that repeated config lookups skip schema conversion entirely."""
+        with patch.object(
+            self.tool_handler,
+            "_convert_schema_to_bedrock_format",
+            wraps=self.tool_handler._convert_schema_to_bedrock_format,
+        ) as convert:
+            self.tool_handler.get_bedrock_tool_config()
+            self.tool_handler.get_bedrock_tool_config()
+
+        assert convert.call_count == len(self.tool_handler.get_supported_tools())
+
+    def test_track_order_new_format(self):
         """Test order tracking with new direct parameter format."""
         tool_use_content = {"orderId": "NEW123", "requestNotifications": True}
 
-        result = await self.tool_handler._track_order(tool_use_content)
+        result = self.tool_handler._track_order(tool_use_content)
 
         assert "orderStatus" in result
         assert "orderNumber" in result
         assert result["orderNumber"] == "NEW123"
         assert "error" not in result
 
-    @pytest.mark.asyncio
-    async def test_track_order_format_compatibility(self):
+    def test_track_order_format_compatibility(self):
         """Test that both old and new formats produce the same result."""
         order_id = "COMPAT123"
 
@@ -453,8 +578,8 @@ class TestToolHandler:
         # New format
         new_format = {"orderId": order_id, "requestNotifications": False}
 
-        result_old = await self.tool_handler._track_order(old_format)
-        result_new = await self.tool_handler._track_order(new_format)
+        result_old = self.tool_handler._track_order(old_format)
+        result_new = self.tool_handler._track_order(new_format)
 
         # Results should be identical (deterministic)
         assert result_old["orderStatus"] == result_new["orderStatus"]
@@ -479,12 +604,11 @@ class TestToolHandler:
         )
         assert is_valid is False
 
-    @pytest.mark.asyncio
-    async def test_timezone_configuration_impact(self):
+    def test_timezone_configuration_impact(self):
         """Test that timezone configuration affects date/time output."""
         # Set custom timezone
         self.tool_handler.set_config("timezone", "Asia/Tokyo")
 
-        result = await self.tool_handler._get_date_and_time()
+        result = self.tool_handler._get_date_and_time()
 
         assert result["timezone"] == "Tokyo"
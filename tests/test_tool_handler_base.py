@@ -89,6 +89,23 @@ class TestToolHandlerBase:
         # Test unsupported tool
         assert handler.is_tool_supported("unknown_tool") is False
 
+    def test_bedrock_tool_config_cached_until_config_changes(self):
+        """Test that the Bedrock tool config is built once per configuration."""
+        handler = MockToolHandler()
+
+        config = handler.get_bedrock_tool_config()
+        assert handler.get_bedrock_tool_config() is config
+        assert [tool["toolSpec"]["name"] for tool in config["tools"]] == ["mock_tool"]
+
+        handler.set_config("key", "value")
+        assert handler.get_bedrock_tool_config() is not config
+        assert handler.get_bedrock_tool_config() == config
+
+        config = handler.get_bedrock_tool_config()
+        handler.config["key"] = "other"
+        handler.invalidate_tool_caches()
+        assert handler.get_bedrock_tool_config() is not config
+
     def test_get_handler_info(self):
         """Test handler information method."""
         config = {"config_key": "config_value"}
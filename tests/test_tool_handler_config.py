@@ -1,7 +1,5 @@
 import json
 
-import pytest
-
 from strands_live.tool_handler import ToolHandler
 
 
@@ -81,8 +79,7 @@ class TestToolHandlerConfiguration:
         assert handler.get_config("timezone") == "UTC"
         assert handler.get_config("new_key") == "new_value"
 
-    @pytest.mark.asyncio
-    async def test_timezone_configuration_impact(self):
+    def test_timezone_configuration_impact(self):
         """Test that timezone configuration affects date/time tool output."""
         timezones = [
             ("America/New_York", "New_York"),
@@ -93,12 +90,11 @@ class TestToolHandlerConfiguration:
 
         for timezone_full, timezone_short in timezones:
             handler = ToolHandler({"timezone": timezone_full})
-            result = await handler._get_date_and_time()
+            result = handler._get_date_and_time()
 
             assert result["timezone"] == timezone_short
 
-    @pytest.mark.asyncio
-    async def test_order_status_configuration_impact(self):
+    def test_order_status_configuration_impact(self):
         """Test that order status configuration affects order tracking."""
         custom_statuses = ["Custom Status A", "Custom Status B", "Custom Status C"]
         custom_weights = [33, 33, 34]
@@ -117,7 +113,7 @@ class TestToolHandlerConfiguration:
                 "requestNotifications": False,
             }
 
-            result = await handler._track_order(tool_use_content)
+            result = handler._track_order(tool_use_content)
             returned_statuses.add(result["orderStatus"])
 
         # Should only return custom statuses
@@ -212,19 +208,18 @@ class TestToolHandlerConfiguration:
 
         assert expected_keys.issubset(config_keys)
 
-    @pytest.mark.asyncio
-    async def test_configuration_persistence_during_execution(self):
+    def test_configuration_persistence_during_execution(self):
         """Test that configuration values persist during tool execution."""
         handler = ToolHandler({"timezone": "Europe/Paris"})
 
         # Execute multiple tools
-        result1 = await handler._get_date_and_time()
+        result1 = handler._get_date_and_time()
 
         # Change configuration
         handler.set_config("timezone", "Asia/Seoul")
 
         # Execute tool again
-        result2 = await handler._get_date_and_time()
+        result2 = handler._get_date_and_time()
 
         # Results should reflect the configuration changes
         assert result1["timezone"] == "Paris"
@@ -245,8 +240,7 @@ class TestToolHandlerConfiguration:
         # Numeric keys should also work (converted to string internally if needed)
         assert handler.get_config(123) == "value2"
 
-    @pytest.mark.asyncio
-    async def test_empty_configuration(self):
+    def test_empty_configuration(self):
         """Test behavior with empty configuration."""
         handler = ToolHandler({})
 
@@ -255,5 +249,5 @@ class TestToolHandlerConfiguration:
         assert len(handler.get_config("order_statuses")) == 8
 
         # Tools should still work
-        result = await handler._get_date_and_time()
+        result = handler._get_date_and_time()
         assert "timezone" in result